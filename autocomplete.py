@@ -0,0 +1,83 @@
+"""
+In-memory prefix index for athlete and meet name autocomplete.
+
+Every name is indexed once per word start ("Lily Smith" under "lily smith" and
+"smith"), lowercased, in one sorted list. A lookup is a bisect to the first key
+starting with the query plus a scan of the matching block, so "sm", "smith"
+and "lily sm" all find Lily Smith - in microseconds for a gym-sized name list.
+
+Matches are ranked by recency: the last date the name appeared (latest meet
+for athletes and meets, created_at for athletes without scores), newest
+first, then alphabetically.
+
+Writes (add) rebuild the key list copy-on-write under a lock, so lookups never
+lock and never see a half-updated list.
+"""
+
+import heapq
+import threading
+from bisect import bisect_left
+from datetime import date, datetime
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return date.min
+    return value if isinstance(value, date) else date.min
+
+def _keys(name):
+    """One lowercase key per word start: 'Lily Smith' -> ['lily smith', 'smith']."""
+    text = ' '.join(name.lower().split())
+    keys = [text]
+    for i, ch in enumerate(text):
+        if ch == ' ':
+            keys.append(text[i + 1:])
+    return keys
+
+class PrefixIndex:
+    """Sorted (key, name) list with recency ranking."""
+    def __init__(self, rows=()):
+        self._lock = threading.Lock()
+        self._state = ([], {})  # (sorted keys, last seen by name), swapped as one
+        self.add_many(rows)
+
+    def __len__(self):
+        return len(self._state[1])
+
+    def add(self, name, seen=None):
+        self.add_many([(name, seen)])
+
+    def add_many(self, rows):
+        """Add names or move their last-seen date forward; rows are (name, date-or-None)."""
+        with self._lock:
+            keys, last_seen = self._state
+            last_seen = dict(last_seen)
+            new_names = []
+            for name, seen in rows:
+                if not name:
+                    continue
+                seen = _as_date(seen)
+                if name not in last_seen:
+                    new_names.append(name)
+                    last_seen[name] = seen
+                elif seen > last_seen[name]:
+                    last_seen[name] = seen
+            if new_names:
+                keys = sorted(keys + [(key, name) for name in new_names for key in _keys(name)])
+            self._state = (keys, last_seen)
+
+    def search(self, query, limit=10):
+        """Names with a word starting with query (case-insensitive), most recent first."""
+        query = ' '.join(query.lower().split())
+        keys, last_seen = self._state
+        matches = set()
+        i = bisect_left(keys, (query,))
+        while i < len(keys) and keys[i][0].startswith(query):
+            matches.add(keys[i][1])
+            i += 1
+        return heapq.nsmallest(limit, matches,
+                               key=lambda name: (-last_seen[name].toordinal(), name.lower()))
@@ -0,0 +1,629 @@
+"""
+Endpoint benchmark harness for the score entry server.
+
+This script will:
+1. Seed a scratch PostgreSQL database with a synthetic gym dataset
+   (athletes across every level, several seasons of multi-date meets,
+   sessions, practice schedules and attendance)
+2. Time every GET /api/* route through the Flask test client
+3. Report p50/p95 latency, query count (from the server's Server-Timing
+   header), DB/serialize time and payload size per endpoint
+4. Write the results as JSON so runs can be compared before/after a change
+5. Optionally check that the in-memory score store (SCORE_STORE=true) answers
+   every score endpoint exactly like the SQL path, tied scores included
+   (seeded scores are multiples of 0.025, so ties are common)
+6. Optionally check that with SNAPSHOT_READS=true every GET route is answered
+   from a local snapshot alone, with Postgres unreachable
+
+The target database is WIPED when seeding. It is read from BENCH_DATABASE_URL,
+never from DATABASE_URL, so a production .env cannot be clobbered by accident.
+
+Usage:
+1. Point BENCH_DATABASE_URL at a local scratch database
+2. Seed and run:   python benchmark_endpoints.py --seed --athletes 150 --seasons 4
+3. Re-run only:    python benchmark_endpoints.py --out after.json
+4. Compare runs:   python benchmark_endpoints.py --compare before.json after.json
+5. Store vs SQL:   python benchmark_endpoints.py --check-store
+6. Snapshot only:  python benchmark_endpoints.py --check-snapshot
+"""
+
+import os
+import sys
+import json
+import random
+import re
+import argparse
+import platform
+import subprocess
+from datetime import date, datetime, time as time_type, timedelta
+from time import perf_counter
+from urllib.parse import urlencode
+
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BENCH_DATABASE_URL = os.environ.get('BENCH_DATABASE_URL')
+
+# Same order the server uses for meet_level_averages
+LEVEL_ORDER = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'XB', 'XS', 'XG', 'XP', 'XD', 'XSA']
+EVENTS = ['Vault', 'Bars', 'Beam', 'Floor']
+SEASON_NAMES = [('Winter', 1, 3), ('Spring', 4, 6), ('Summer', 7, 8), ('Fall', 9, 12)]
+
+FIRST_NAMES = ['Ava', 'Mia', 'Zoe', 'Lily', 'Emma', 'Nora', 'Ella', 'Ruby', 'Isla', 'Cora',
+               'Maya', 'Hazel', 'Ivy', 'Luna', 'Aria', 'Jade', 'Quinn', 'Sage', 'Tess', 'Wren']
+LAST_NAMES = ['Adams', 'Baker', 'Chen', 'Diaz', 'Evans', 'Flores', 'Garcia', 'Hughes', 'Ito', 'Jones',
+              'Kim', 'Lopez', 'Moore', 'Nguyen', 'Ortiz', 'Patel', 'Reyes', 'Smith', 'Tran', 'Walsh']
+MEET_NAMES = ['Gymfest Classic', 'Winter Invitational', 'Snowflake Challenge', 'Valentine Cup',
+              'Spring Fling', 'State Qualifier', 'Coastal Open', 'Harbor Invitational',
+              'Desert Classic', 'Mountain Cup', 'Sunshine Meet', 'Regional Championship']
+
+# ============================================================
+# SCHEMA + SYNTHETIC DATA
+# ============================================================
+SCHEMA = '''
+    DROP TABLE IF EXISTS attendance, special_practice_dates, practice_schedules,
+                         sessions, athletes, scores CASCADE;
+
+    CREATE TABLE scores (
+        id SERIAL PRIMARY KEY,
+        AthleteName VARCHAR(255),
+        Level VARCHAR(10),
+        CompYear VARCHAR(10),
+        MeetName VARCHAR(255),
+        MeetDate DATE,
+        Event VARCHAR(50),
+        StartValue DECIMAL(5,3),
+        Score DECIMAL(5,3),
+        Place INTEGER
+    );
+    CREATE TABLE athletes (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) UNIQUE NOT NULL,
+        current_level VARCHAR(10),
+        active BOOLEAN DEFAULT TRUE,
+        birthday DATE,
+        created_at TIMESTAMP DEFAULT NOW()
+    );
+    CREATE TABLE sessions (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(50) NOT NULL,
+        year INTEGER NOT NULL,
+        season VARCHAR(20) NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(year, season)
+    );
+    CREATE TABLE practice_schedules (
+        id SERIAL PRIMARY KEY,
+        session_id INTEGER REFERENCES sessions(id) ON DELETE CASCADE,
+        level VARCHAR(10) NOT NULL,
+        day_of_week SMALLINT NOT NULL,
+        start_time TIME NOT NULL,
+        end_time TIME NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(session_id, level, day_of_week)
+    );
+    CREATE TABLE special_practice_dates (
+        id SERIAL PRIMARY KEY,
+        session_id INTEGER REFERENCES sessions(id) ON DELETE CASCADE,
+        practice_date DATE NOT NULL,
+        level VARCHAR(10) NOT NULL,
+        start_time TIME NOT NULL,
+        end_time TIME NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(session_id, practice_date, level)
+    );
+    CREATE TABLE attendance (
+        id SERIAL PRIMARY KEY,
+        athlete_id INTEGER REFERENCES athletes(id) ON DELETE CASCADE,
+        session_id INTEGER REFERENCES sessions(id) ON DELETE CASCADE,
+        practice_date DATE NOT NULL,
+        level VARCHAR(10) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'none',
+        notes TEXT,
+        late_minutes INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(athlete_id, practice_date)
+    );
+    CREATE INDEX idx_sessions_dates ON sessions(start_date, end_date);
+    CREATE INDEX idx_schedules_session ON practice_schedules(session_id);
+    CREATE INDEX idx_attendance_session ON attendance(session_id);
+    CREATE INDEX idx_attendance_date ON attendance(practice_date);
+'''
+
+def _random_score(rng, level_idx):
+    """Plausible event score; higher levels score a little lower on average."""
+    base = 9.35 - (level_idx % 10) * 0.04
+    value = min(9.975, max(7.0, rng.gauss(base, 0.35)))
+    return round(round(value / 0.025) * 0.025, 3)
+
+def seed_database(dsn, athletes=120, seasons=3, meets_per_season=6, seed=42):
+    """Drop and recreate the tables, then fill them with synthetic data."""
+    rng = random.Random(seed)
+    today = date.today()
+    # A CompYear runs Sep..Aug and is named after the year it ends in
+    current_comp_year = today.year + 1 if today.month >= 9 else today.year
+    comp_years = [current_comp_year - i for i in range(seasons - 1, -1, -1)]
+
+    conn = psycopg2.connect(dsn)
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA)
+
+    # ---- Athletes: spread across all levels, each with a starting level ----
+    names = set()
+    while len(names) < athletes:
+        names.add(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{'' if len(names) < 400 else ' ' + str(len(names))}")
+    roster = []
+    for i, name in enumerate(sorted(names)):
+        start_idx = i % len(LEVEL_ORDER)
+        roster.append({'name': name, 'start_idx': start_idx,
+                       'birthday': date(today.year - 7 - start_idx // 2, rng.randint(1, 12), rng.randint(1, 28))})
+
+    # ---- Scores: every athlete competes at every meet of every season ----
+    score_rows = []
+    final_level = {}
+    for season_no, comp_year in enumerate(comp_years):
+        season_start = date(comp_year - 1, 10, 1)
+        for meet_no in range(meets_per_season):
+            meet_name = MEET_NAMES[meet_no % len(MEET_NAMES)]
+            first_day = season_start + timedelta(days=meet_no * (180 // max(meets_per_season, 1)))
+            if first_day > today:
+                continue
+            meet_dates = [first_day + timedelta(days=d) for d in range(rng.randint(1, 3))]
+            for athlete in roster:
+                # Athletes usually move up one level per season, sometimes repeat
+                level_idx = min(athlete['start_idx'] + season_no - (1 if season_no and rng.random() < 0.3 else 0),
+                                len(LEVEL_ORDER) - 1)
+                level = LEVEL_ORDER[level_idx]
+                final_level[athlete['name']] = level
+                meet_date = rng.choice(meet_dates)
+                total = 0
+                for event in EVENTS:
+                    score = _random_score(rng, level_idx)
+                    total += score
+                    score_rows.append((athlete['name'], level, str(comp_year), meet_name, meet_date,
+                                       event, score, rng.randint(1, 12)))
+                score_rows.append((athlete['name'], level, str(comp_year), meet_name, meet_date,
+                                   'All Around', round(total, 3), rng.randint(1, 12)))
+    execute_values(cursor, '''
+        INSERT INTO scores (AthleteName, Level, CompYear, MeetName, MeetDate, Event, Score, Place)
+        VALUES %s
+    ''', score_rows, page_size=1000)
+
+    execute_values(cursor, '''
+        INSERT INTO athletes (name, current_level, active, birthday) VALUES %s
+    ''', [(a['name'], final_level.get(a['name'], LEVEL_ORDER[a['start_idx']]), rng.random() > 0.05, a['birthday'])
+          for a in roster])
+    cursor.execute('SELECT id, name, current_level FROM athletes WHERE active = TRUE')
+    active_athletes = cursor.fetchall()
+
+    # ---- Sessions: four per calendar year, covering every season and today ----
+    session_rows = []
+    for year in range(comp_years[0] - 1, today.year + 1):
+        for season, first_month, last_month in SEASON_NAMES:
+            start = date(year, first_month, 1)
+            end = (date(year, last_month % 12 + 1, 1) if last_month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+            session_rows.append((f'{season} {str(year)[2:]}', year, season, start, end))
+    execute_values(cursor, '''
+        INSERT INTO sessions (name, year, season, start_date, end_date) VALUES %s RETURNING id, start_date, end_date
+    ''', session_rows)
+    sessions = cursor.fetchall()
+
+    schedule_rows = []
+    special_rows = []
+    attendance_rows = []
+    for session_id, start, end in sessions:
+        days_by_level = {}
+        for level in LEVEL_ORDER:
+            days = sorted(rng.sample(range(1, 6), 3 if LEVEL_ORDER.index(level) > 3 else 2))
+            days_by_level[level] = set(days)
+            for dow in days:
+                schedule_rows.append((session_id, level, dow, time_type(16, 0), time_type(19, 0)))
+        for _ in range(3):
+            special_rows.append((session_id, start + timedelta(days=rng.randint(0, (end - start).days)),
+                                 rng.choice(LEVEL_ORDER), time_type(9, 0), time_type(12, 0), 'Extra practice'))
+        if start > today:
+            continue
+        # Attendance for every scheduled practice up to today
+        day = start
+        while day <= min(end, today):
+            dow = (day.weekday() + 1) % 7
+            for athlete_id, _, level in active_athletes:
+                if dow in days_by_level.get(level, ()):
+                    status = rng.choices(['present', 'absent', 'partial'], weights=[85, 10, 5])[0]
+                    late = 5 if status == 'present' and rng.random() < 0.05 else 0
+                    attendance_rows.append((athlete_id, session_id, day, level, status, None, late))
+            day += timedelta(days=1)
+
+    execute_values(cursor, '''
+        INSERT INTO practice_schedules (session_id, level, day_of_week, start_time, end_time) VALUES %s
+    ''', schedule_rows)
+    execute_values(cursor, '''
+        INSERT INTO special_practice_dates (session_id, practice_date, level, start_time, end_time, description)
+        VALUES %s ON CONFLICT DO NOTHING
+    ''', special_rows)
+    execute_values(cursor, '''
+        INSERT INTO attendance (athlete_id, session_id, practice_date, level, status, notes, late_minutes)
+        VALUES %s
+    ''', attendance_rows, page_size=2000)
+
+    conn.commit()
+    cursor.execute('ANALYZE')
+    counts = {}
+    for table in ('scores', 'athletes', 'sessions', 'practice_schedules', 'special_practice_dates', 'attendance'):
+        cursor.execute(f'SELECT COUNT(*) FROM {table}')
+        counts[table] = cursor.fetchone()[0]
+    cursor.close()
+    conn.close()
+    return counts
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers."""
+    if not values:
+        return None
+    s = sorted(values)
+    k = (len(s) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+def load_server(dsn):
+    """Import the Flask app against the benchmark database."""
+    os.environ['DATABASE_URL'] = dsn
+    import score_entry_server as server
+    return server
+
+SERVER_TIMING_RE = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+def parse_server_timing(header):
+    """Split the server's Server-Timing header into {metric: ms} plus the query count."""
+    timings = {}
+    queries = 0
+    for name, dur, count in SERVER_TIMING_RE.findall(header or ''):
+        timings[name] = float(dur)
+        if count:
+            queries = int(count)
+    return timings, queries
+
+def sample_arguments(dsn):
+    """Pick realistic query arguments (newest meet, a busy athlete, ...) from the database."""
+    conn = psycopg2.connect(dsn, cursor_factory=RealDictCursor)
+    cursor = conn.cursor()
+    cursor.execute('SELECT MeetName, CompYear FROM scores ORDER BY MeetDate DESC LIMIT 1')
+    meet = cursor.fetchone()
+    cursor.execute('''
+        SELECT AthleteName, COUNT(*) AS n FROM scores GROUP BY AthleteName ORDER BY n DESC, AthleteName LIMIT 1
+    ''')
+    athlete = cursor.fetchone()
+    cursor.execute('''
+        SELECT * FROM sessions WHERE start_date <= CURRENT_DATE AND end_date >= CURRENT_DATE LIMIT 1
+    ''')
+    session = cursor.fetchone()
+    cursor.execute('''
+        SELECT practice_date FROM attendance WHERE practice_date <= CURRENT_DATE
+        ORDER BY practice_date DESC LIMIT 1
+    ''')
+    practice = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return {
+        'meet_name': meet['meetname'] if meet else None,
+        'comp_year': meet['compyear'] if meet else None,
+        'athlete': athlete['athletename'] if athlete else None,
+        'session_id': session['id'] if session else None,
+        'practice_date': practice['practice_date'].isoformat() if practice else None,
+    }
+
+def build_cases(app, sample):
+    """Map every GET /api/* rule to one or more concrete URLs."""
+    def url(path, **args):
+        args = {k: v for k, v in args.items() if v is not None}
+        return f"{path}?{urlencode(args)}" if args else path
+
+    known = {
+        '/api/meet_scores': [('meet_scores', url('/api/meet_scores', meet_name=sample['meet_name'],
+                                                 comp_year=sample['comp_year']))],
+        '/api/athlete_profile': [
+            ('athlete_profile', url('/api/athlete_profile', name=sample['athlete'])),
+            ('athlete_profile[all_levels]', url('/api/athlete_profile', name=sample['athlete'], all_levels='true')),
+        ],
+        '/api/meet_level_averages': [('meet_level_averages', url('/api/meet_level_averages',
+                                                                 comp_year=sample['comp_year']))],
+        '/api/team_scores': [('team_scores', url('/api/team_scores', meet_name=sample['meet_name'],
+                                                 comp_year=sample['comp_year']))],
+        '/api/practice_schedules': [
+            ('practice_schedules', '/api/practice_schedules'),
+            ('practice_schedules[session]', url('/api/practice_schedules', session_id=sample['session_id'])),
+        ],
+        '/api/practice_for_date': [('practice_for_date', url('/api/practice_for_date',
+                                                             date=sample['practice_date']))],
+        '/api/attendance/session/<int:session_id>': [
+            ('attendance_session', f"/api/attendance/session/{sample['session_id']}"),
+        ],
+    }
+
+    cases = []
+    skipped = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if not rule.rule.startswith('/api/') or 'GET' not in rule.methods:
+            continue
+        if rule.rule in known:
+            cases.extend(known[rule.rule])
+        elif not rule.arguments:
+            cases.append((rule.rule[len('/api/'):], rule.rule))
+        else:
+            skipped.append(rule.rule)
+    return cases, skipped
+
+def run_benchmark(dsn, iterations=20, warmup=2):
+    server = load_server(dsn)
+    client = server.app.test_client()
+    sample = sample_arguments(dsn)
+    cases, skipped = build_cases(server.app, sample)
+
+    results = {}
+    for label, target in cases:
+        # Cold call: empty in-process cache
+        server.cache.invalidate()
+        t0 = perf_counter()
+        response = client.get(target)
+        cold_ms = (perf_counter() - t0) * 1000
+        _, cold_queries = parse_server_timing(response.headers.get('Server-Timing'))
+
+        for _ in range(warmup):
+            client.get(target)
+
+        timings = []
+        queries = []
+        db_ms = []
+        serialize_ms = []
+        size = 0
+        status = response.status_code
+        for _ in range(iterations):
+            t0 = perf_counter()
+            response = client.get(target)
+            timings.append((perf_counter() - t0) * 1000)
+            server_timing, query_count = parse_server_timing(response.headers.get('Server-Timing'))
+            queries.append(query_count)
+            db_ms.append(server_timing.get('db', 0.0))
+            serialize_ms.append(server_timing.get('serialize', 0.0))
+            size = len(response.data)
+            status = response.status_code
+
+        results[label] = {
+            'url': target,
+            'status': status,
+            'cold_ms': round(cold_ms, 3),
+            'cold_queries': cold_queries,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': int(percentile(queries, 50)),
+            'db_p50_ms': round(percentile(db_ms, 50), 3),
+            'serialize_p50_ms': round(percentile(serialize_ms, 50), 3),
+            'payload_bytes': size,
+        }
+        print(f"  {label:<32} p50 {results[label]['p50_ms']:>9.2f} ms  p95 {results[label]['p95_ms']:>9.2f} ms  "
+              f"{results[label]['queries']:>5} queries  {size:>9} B  [{status}]")
+
+    for rule in skipped:
+        print(f"  {rule:<32} skipped (no sample arguments)")
+    return results, skipped, sample
+
+def _first_difference(a, b, path=''):
+    """Path and values of the first place two normalized responses differ, or None."""
+    if type(a) != type(b):
+        return f"{path}: {a!r} != {b!r}"
+    if isinstance(a, dict):
+        for key in sorted(set(a) | set(b), key=str):
+            if key not in a or key not in b:
+                return f"{path}.{key}: only in {'store' if key in a else 'SQL'}"
+            found = _first_difference(a[key], b[key], f"{path}.{key}")
+            if found:
+                return found
+        return None
+    if isinstance(a, list):
+        if len(a) != len(b):
+            return f"{path}: {len(a)} items != {len(b)}"
+        for i, (x, y) in enumerate(zip(a, b)):
+            found = _first_difference(x, y, f"{path}[{i}]")
+            if found:
+                return found
+        return None
+    return None if a == b else f"{path}: {a!r} != {b!r}"
+
+def check_score_store(dsn):
+    """
+    Request every score store backed URL (all meets, comp years and athletes) with the
+    store and with the SQL path, and report the responses that differ. Returns the count.
+    """
+    server = load_server(dsn)
+    from score_store import ScoreStore
+    store = ScoreStore(server._score_store_query, version_check_seconds=0)
+    store.load()
+    client = server.app.test_client()
+
+    conn = psycopg2.connect(dsn, cursor_factory=RealDictCursor)
+    cursor = conn.cursor()
+    cursor.execute('SELECT DISTINCT MeetName, CompYear FROM scores ORDER BY CompYear, MeetName')
+    meets = cursor.fetchall()
+    cursor.execute('SELECT DISTINCT AthleteName FROM scores ORDER BY AthleteName')
+    athletes = [row['athletename'] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+
+    urls = ['/api/meets', '/api/meets?limit=5', '/api/personal_bests']
+    for comp_year in sorted({m['compyear'] for m in meets}):
+        urls.append(f"/api/meet_level_averages?{urlencode({'comp_year': comp_year})}")
+    for m in meets:
+        urls.append(f"/api/meet_scores?{urlencode({'meet_name': m['meetname'], 'comp_year': m['compyear']})}")
+    for name in athletes:
+        urls.append(f"/api/athlete_profile?{urlencode({'name': name})}")
+        urls.append(f"/api/athlete_profile?{urlencode({'name': name, 'all_levels': 'true'})}")
+
+    responses = {}
+    for label, source in (('store', store), ('sql', None)):
+        server.score_store = source
+        for target in urls:
+            server.cache.invalidate()
+            server.season_cache.invalidate()
+            responses.setdefault(target, {})[label] = client.get(target).get_json()
+
+    mismatches = 0
+    for target in urls:
+        found = _first_difference(responses[target]['store'], responses[target]['sql'])
+        if found:
+            mismatches += 1
+            print(f"  DIFF {target}\n       {found}")
+    print(f"  {len(urls) - mismatches}/{len(urls)} responses identical")
+    return mismatches
+
+# Streamed exports use Postgres-only named cursors and never read the snapshot
+SNAPSHOT_EXEMPT = ('export/',)
+UNREACHABLE_DATABASE_URL = 'postgresql://gymfest@127.0.0.1:1/unreachable?connect_timeout=1'
+
+def check_snapshot(dsn, path='bench_snapshot.db'):
+    """
+    Answer every GET case from Postgres, then copy the database to a snapshot at path,
+    make Postgres unreachable and answer them again with SNAPSHOT_READS on. Reports
+    routes that fail (or, for data routes, differ) without Postgres. Returns the count.
+    """
+    server = load_server(dsn)
+    client = server.app.test_client()
+    cases, _ = build_cases(server.app, sample_arguments(dsn))
+    cases = [(label, target) for label, target in cases if not label.startswith(SNAPSHOT_EXEMPT)]
+
+    def answer_all():
+        answers = {}
+        for label, target in cases:
+            server.cache.invalidate()
+            server.season_cache.invalidate()
+            response = client.get(target)
+            answers[label] = (response.status_code, response.get_json(silent=True))
+        return answers
+
+    expected = answer_all()
+    server.SNAPSHOT_PATH = path
+    server.refresh_local_snapshot(full=True)
+    # From here on only the snapshot can answer
+    server.db_pool.closeall()
+    server.db_pool = None
+    server.DATABASE_URL = UNREACHABLE_DATABASE_URL
+    server.SNAPSHOT_READS = True
+    server.team_scores.rebuild()
+    actual = answer_all()
+
+    failures = 0
+    for label, target in cases:
+        (want_status, want), (got_status, got) = expected[label], actual[label]
+        # Admin/diagnostic routes (_metrics, jobs, ...) describe the process, not the data
+        found = None
+        if got_status != want_status:
+            found = f"status {got_status} (Postgres: {want_status})"
+        elif not label.startswith(('_', 'jobs')):
+            found = _first_difference(got, want)
+        if found:
+            failures += 1
+            print(f"  FAIL {target}\n       {found}")
+    print(f"  {len(cases) - failures}/{len(cases)} routes answered from the snapshot alone")
+    return failures
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def compare(before_path, after_path):
+    """Print a side-by-side comparison of two result files."""
+    with open(before_path) as f:
+        before = json.load(f)['results']
+    with open(after_path) as f:
+        after = json.load(f)['results']
+    print(f"{'endpoint':<32} {'p50 before':>11} {'p50 after':>10} {'change':>8} {'queries':>13} {'bytes':>19}")
+    for label in sorted(set(before) | set(after)):
+        b, a = before.get(label), after.get(label)
+        if not b or not a:
+            print(f"{label:<32} {'(only in ' + ('after' if a else 'before') + ')':>30}")
+            continue
+        change = (a['p50_ms'] - b['p50_ms']) / b['p50_ms'] * 100 if b['p50_ms'] else 0
+        print(f"{label:<32} {b['p50_ms']:>11.2f} {a['p50_ms']:>10.2f} {change:>+7.1f}% "
+              f"{b['queries']:>6}->{a['queries']:<6} {b['payload_bytes']:>9}->{a['payload_bytes']:<9}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the score entry server API.')
+    parser.add_argument('--seed', action='store_true', help='wipe and re-seed BENCH_DATABASE_URL first')
+    parser.add_argument('--athletes', type=int, default=120)
+    parser.add_argument('--seasons', type=int, default=3)
+    parser.add_argument('--meets', type=int, default=6, help='meets per season')
+    parser.add_argument('--random-seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    parser.add_argument('--check-store', action='store_true',
+                        help='compare score store responses with the SQL path instead of timing')
+    parser.add_argument('--check-snapshot', metavar='PATH', nargs='?', const='bench_snapshot.db',
+                        help='answer every GET route from a snapshot at PATH with Postgres unreachable')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if not BENCH_DATABASE_URL:
+        print("ERROR: BENCH_DATABASE_URL not set")
+        print("Point it at a scratch database, e.g. postgresql://localhost/gymfest_bench")
+        sys.exit(1)
+    if BENCH_DATABASE_URL == os.environ.get('DATABASE_URL'):
+        print("ERROR: BENCH_DATABASE_URL must not be the same database as DATABASE_URL")
+        sys.exit(1)
+
+    dataset = None
+    if args.seed:
+        print(f"Seeding {args.athletes} athletes x {args.seasons} seasons x {args.meets} meets...")
+        dataset = seed_database(BENCH_DATABASE_URL, args.athletes, args.seasons, args.meets, args.random_seed)
+        for table, count in dataset.items():
+            print(f"   {table}: {count} rows")
+
+    if args.check_store:
+        print("\nComparing score store responses with the SQL path...")
+        sys.exit(1 if check_score_store(BENCH_DATABASE_URL) else 0)
+    if args.check_snapshot:
+        print("\nAnswering every GET route from a snapshot with Postgres unreachable...")
+        sys.exit(1 if check_snapshot(BENCH_DATABASE_URL, args.check_snapshot) else 0)
+
+    print(f"\nTiming endpoints ({args.iterations} iterations, {args.warmup} warmup)...")
+    results, skipped, sample = run_benchmark(BENCH_DATABASE_URL, args.iterations, args.warmup)
+
+    report = {
+        'meta': {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'dataset': dataset or {'athletes': args.athletes, 'seasons': args.seasons, 'meets': args.meets,
+                                   'seeded': False},
+            'sample': sample,
+            'skipped': skipped,
+        },
+        'results': results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\nResults written to {args.out}")
+
+if __name__ == '__main__':
+    main()
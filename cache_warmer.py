@@ -0,0 +1,75 @@
+"""
+Debounced background cache warmer.
+
+score_entry_server calls trigger() after score writes (and once at startup).
+A burst of triggers - a coach entering a whole level one athlete at a time -
+collapses into one warm cycle that runs debounce_seconds after the last
+trigger, or max_delay_seconds after the first one if entries never pause.
+
+The cycle itself is a plain callable (the server's is a series of GETs through
+the Flask test client, so responses land in the same caches real requests use).
+It runs on one daemon thread per process; a trigger during a cycle schedules
+another cycle after it.
+"""
+
+import threading
+import time
+
+class CacheWarmer:
+    def __init__(self, warm, debounce_seconds=5.0, max_delay_seconds=30.0):
+        self._warm = warm
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._first_trigger = None
+        self._last_trigger = None
+        self._thread = None
+        self.cycles = 0
+        self.last_run = None      # (started_at wall clock, seconds, error or None)
+
+    def trigger(self):
+        """Request a warm cycle; returns immediately."""
+        with self._lock:
+            now = time.monotonic()
+            if self._first_trigger is None:
+                self._first_trigger = now
+            self._last_trigger = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _due_in(self):
+        """Seconds until the pending cycle should start, or None if nothing is pending."""
+        with self._lock:
+            if self._first_trigger is None:
+                return None
+            now = time.monotonic()
+            return max(0.0, min(self._last_trigger + self.debounce_seconds,
+                                self._first_trigger + self.max_delay_seconds) - now)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            delay = self._due_in()
+            while delay:
+                # New triggers push the deadline out (up to max_delay_seconds)
+                self._wake.wait(delay)
+                self._wake.clear()
+                delay = self._due_in()
+            if delay is None:
+                continue
+            with self._lock:
+                self._first_trigger = self._last_trigger = None
+            started = time.time()
+            t0 = time.monotonic()
+            error = None
+            try:
+                self._warm()
+            except Exception as e:
+                error = str(e)
+                print(f"[WARM] Cache warm cycle failed: {e}")
+            self.cycles += 1
+            self.last_run = (started, time.monotonic() - t0, error)
@@ -0,0 +1,150 @@
+"""
+Small in-process background job queue.
+
+Heavy recomputations (snapshot refreshes, cache rebuilds, imports) run on a
+bounded thread pool instead of inside a request, so they don't hold a gunicorn
+worker or a request's pool connection for their whole duration.
+
+Job kinds are registered up front (register(kind, fn)); fn(ctx, **params)
+runs on the pool and may:
+- report progress with ctx.progress(fraction, message)
+- honour cancellation by checking ctx.cancelled (or calling
+  ctx.check_cancelled(), which raises JobCancelled)
+Its return value becomes the job's result.
+
+The registry is in memory and per process: job ids are only known to the
+worker that accepted them (the Procfile runs a single gunicorn worker), and
+finished jobs are kept until `keep` newer ones have finished.
+"""
+
+import time
+import uuid
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been asked to stop."""
+
+class InvalidJob(ValueError):
+    """Raised by submit() for an unregistered kind or params the job doesn't accept."""
+
+class JobContext:
+    """Handed to the job function: progress reporting and cancellation checks."""
+    def __init__(self, job):
+        self._job = job
+
+    @property
+    def cancelled(self):
+        return self._job.cancel_requested.is_set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, fraction, message=None):
+        self._job.progress = max(0.0, min(float(fraction), 1.0))
+        if message is not None:
+            self._job.message = message
+
+class Job:
+    def __init__(self, kind, params):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = 'queued'
+        self.progress = 0.0
+        self.message = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = threading.Event()
+        self.future = None
+
+    @property
+    def finished(self):
+        return self.status in ('succeeded', 'failed', 'cancelled')
+
+    def to_dict(self):
+        return {
+            'id': self.id, 'kind': self.kind, 'params': self.params, 'status': self.status,
+            'progress': round(self.progress, 3), 'message': self.message,
+            'result': self.result, 'error': self.error,
+            'created_at': self.created_at, 'started_at': self.started_at, 'finished_at': self.finished_at,
+        }
+
+class JobRegistry:
+    def __init__(self, max_workers=2, keep=100):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._kinds = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.keep = keep
+
+    def register(self, kind, fn):
+        self._kinds[kind] = fn
+
+    @property
+    def kinds(self):
+        return sorted(self._kinds)
+
+    def submit(self, kind, params=None):
+        if kind not in self._kinds:
+            raise InvalidJob(f'Unknown job kind: {kind}')
+        params = params or {}
+        try:
+            inspect.signature(self._kinds[kind]).bind(None, **params)
+        except TypeError as e:
+            raise InvalidJob(f'Invalid params for {kind}: {e}')
+        job = Job(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        if job.cancel_requested.is_set():
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            return
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            job.result = self._kinds[job.kind](JobContext(job), **job.params)
+            job.progress = 1.0
+            job.status = 'succeeded'
+        except JobCancelled:
+            job.status = 'cancelled'
+        except Exception as e:
+            job.error = f'{type(e).__name__}: {e}'
+            job.status = 'failed'
+            print(f"[JOBS] {job.kind} {job.id} failed: {job.error}")
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def cancel(self, job_id):
+        """Ask a job to stop; queued jobs never start, running ones stop at their next check."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if not job.finished:
+            job.cancel_requested.set()
+            if job.future is not None and job.future.cancel():
+                job.status = 'cancelled'
+                job.finished_at = time.time()
+        return job
+
+    def _prune(self):
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job.id]
@@ -0,0 +1,138 @@
+"""
+In-process pub/sub for the live meet scoreboard (Server-Sent Events).
+
+submit_scores publishes the rows it just committed to the meet's topic; each
+open /api/live/<meet> stream is a Subscription reading from its own bounded
+buffer. Streams never touch the database - the PB flags are computed once by
+the writer, not once per viewer.
+
+Every event gets an id (process epoch plus a per-topic sequence number), and each topic
+keeps its last `history` events, so a browser that reconnects with
+Last-Event-ID gets what it missed. A subscriber that falls behind by more
+than `buffer_size` events (or reconnects after its events left the history)
+gets a single 'resync' event instead, telling it to refetch the full meet.
+
+Topics live in this process: a write seen by one gunicorn worker reaches that
+worker's subscribers only (the Procfile runs a single worker).
+
+Each open stream holds one of the worker's request threads, so LiveFeed takes
+a max_subscribers cap: subscribe() returns None once that many are open,
+and the server answers 503 instead of letting viewers starve the writers.
+"""
+
+import uuid
+import threading
+from collections import deque
+
+RESYNC = 'resync'
+
+class Subscription:
+    def __init__(self, feed, topic, buffer_size):
+        self._feed = feed
+        self.topic = topic
+        self._buffer = deque()
+        self._buffer_size = buffer_size
+        self._ready = threading.Condition()
+        self._overflowed = False
+        self.closed = False
+
+    def _put(self, event):
+        with self._ready:
+            if self._overflowed:
+                return
+            if len(self._buffer) >= self._buffer_size:
+                # Too slow to keep up: drop what's buffered and ask for a refetch
+                self._buffer.clear()
+                self._overflowed = True
+            else:
+                self._buffer.append(event)
+            self._ready.notify()
+
+    def get(self, timeout):
+        """Next (id, name, data) event, or None after timeout seconds with nothing to send."""
+        with self._ready:
+            if not self._buffer and not self._overflowed:
+                self._ready.wait(timeout)
+            if self._overflowed:
+                self._overflowed = False
+                return (None, RESYNC, None)
+            if self._buffer:
+                return self._buffer.popleft()
+            return None
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._feed._unsubscribe(self)
+
+class LiveFeed:
+    def __init__(self, buffer_size=100, history=200, max_subscribers=None):
+        self.buffer_size = buffer_size
+        self.history = history
+        self.max_subscribers = max_subscribers
+        self.epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._subscribers = {}   # topic -> set of Subscription
+        self._history = {}       # topic -> deque of (seq, name, data)
+
+    def has_subscribers(self, topic):
+        return bool(self._subscribers.get(topic))
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, topic, last_event_id=None):
+        """
+        New subscription, or None if max_subscribers are already open. With a
+        Last-Event-ID, missed events are replayed (or a resync queued).
+        """
+        sub = Subscription(self, topic, self.buffer_size)
+        with self._lock:
+            if self.max_subscribers is not None and \
+                    sum(len(subs) for subs in self._subscribers.values()) >= self.max_subscribers:
+                return None
+            self._subscribers.setdefault(topic, set()).add(sub)
+            if last_event_id:
+                epoch, _, seq = last_event_id.partition('-')
+                history = self._history.get(topic) or deque(maxlen=self.history)
+                if epoch != self.epoch or not seq.isdigit():
+                    # Issued by another process (restart, other worker): we can't tell what was missed
+                    sub._overflowed = True
+                elif len(history) == history.maxlen and history[0][0] > int(seq) + 1:
+                    # Some of the missed events have already left the history
+                    sub._overflowed = True
+                else:
+                    for event in history:
+                        if event[0] > int(seq):
+                            sub._put(event)
+        return sub
+
+    def last_seq(self, topic):
+        history = self._history.get(topic)
+        return history[-1][0] if history else 0
+
+    def event_id(self, seq):
+        """The SSE id for an event sequence number."""
+        return f'{self.epoch}-{seq}'
+
+    def publish(self, topic, name, data):
+        """Send an event to every subscriber of topic; returns its sequence number."""
+        with self._lock:
+            history = self._history.get(topic)
+            if history is None:
+                history = self._history[topic] = deque(maxlen=self.history)
+            event = (history[-1][0] + 1 if history else 1, name, data)
+            history.append(event)
+            # Fan out under the lock so every subscriber sees events in sequence order
+            for sub in self._subscribers.get(topic, ()):
+                sub._put(event)
+        return event[0]
+
+    def _unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.topic]
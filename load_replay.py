@@ -0,0 +1,413 @@
+"""
+Load generator that replays the dashboard pages' fetch patterns.
+
+Each virtual user repeatedly "opens" one of the dashboard pages and issues the
+same sequence of API calls the page's JavaScript makes, with think time between
+page loads and between taps:
+
+- attendance.html:      sessions, sessions/current, levels, practice_dates,
+                        practice_for_date, then attendance posts per athlete
+- personal_bests.html:  meets, then meet_scores for the newest meet and a few
+                        more meets as the user browses the dropdown
+- athlete.html:         athletes?active=false, then athlete_profile
+- meet_averages.html:   meet_level_averages for a comp year
+- index.html:           recent_athletes + recent_meets (fired together)
+
+Reports throughput, error rate and latency percentiles per endpoint and per
+page, plus a time series so pool exhaustion (5xx bursts) and cache warm-up
+(first request vs steady state) are visible.
+
+Usage:
+1. Start a server against a scratch database, or let the tool spawn gunicorn:
+   python load_replay.py --spawn --workers 2 --threads 4 --users 30 --duration 60
+2. Or replay against an already running server:
+   python load_replay.py --url http://localhost:5050 --users 20 --duration 120
+3. Add --submit-scores to include score entry (inserts rows!) and
+   --read-only to skip the attendance posts.
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from collections import defaultdict
+from datetime import datetime
+from time import perf_counter, sleep, time
+from urllib.parse import urlsplit, urlencode, quote
+
+# Relative page weights: attendance and PB pages dominate on meet weekends
+PAGE_WEIGHTS = {
+    'attendance': 4,
+    'personal_bests': 4,
+    'athlete': 2,
+    'meet_averages': 1,
+    'score_entry': 1,
+}
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers."""
+    if not values:
+        return None
+    s = sorted(values)
+    k = (len(s) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+# ============================================================
+# HTTP CLIENT (one keep-alive connection per virtual user)
+# ============================================================
+class Client:
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.https = parts.scheme == 'https'
+        self.timeout = timeout
+        self.conn = None
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        self.conn = cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method, path, body=None):
+        """Return (status, body bytes). Status 0 means a transport error."""
+        headers = {'Accept': 'application/json'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.conn is None:
+                self._connect()
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                response = self.conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                # Server closed the keep-alive socket; reconnect once
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    return 0, b''
+        return 0, b''
+
+# ============================================================
+# RESULTS
+# ============================================================
+class Recorder:
+    """Thread-safe store of per-request samples."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []       # (start_offset_s, endpoint, page, ms, status)
+        self.pages = []         # (page, ms, ok)
+        self.started = perf_counter()
+
+    def record(self, endpoint, page, ms, status):
+        with self.lock:
+            self.samples.append((perf_counter() - self.started, endpoint, page, ms, status))
+
+    def record_page(self, page, ms, ok):
+        with self.lock:
+            self.pages.append((page, ms, ok))
+
+class VirtualUser(threading.Thread):
+    def __init__(self, user_id, args, fixtures, recorder, stop_at):
+        super().__init__(daemon=True)
+        self.rng = random.Random(args.random_seed + user_id)
+        self.client = Client(args.url, args.timeout)
+        self.args = args
+        self.fixtures = fixtures
+        self.recorder = recorder
+        self.stop_at = stop_at
+        self.pages = list(PAGE_WEIGHTS)
+        self.weights = [PAGE_WEIGHTS[p] for p in self.pages]
+        self.page_failed = False
+
+    # ---- helpers ----
+    def think(self, mean_seconds):
+        """Exponentially distributed pause, scaled by --think-scale."""
+        if mean_seconds and self.args.think_scale > 0:
+            sleep(min(self.rng.expovariate(1 / (mean_seconds * self.args.think_scale)),
+                      mean_seconds * self.args.think_scale * 5))
+
+    def call(self, page, endpoint, path, method='GET', body=None):
+        t0 = perf_counter()
+        status, data = self.client.request(method, path, body)
+        self.recorder.record(endpoint, page, (perf_counter() - t0) * 1000, status)
+        if status >= 500 or status == 0:
+            self.page_failed = True
+        if status == 200 and data:
+            try:
+                return json.loads(data)
+            except ValueError:
+                return None
+        return None
+
+    def call_parallel(self, page, calls):
+        """Fire several GETs at once, like Promise.all in the page."""
+        threads = []
+        for endpoint, path in calls:
+            client = Client(self.args.url, self.args.timeout)
+            def run(endpoint=endpoint, path=path, client=client):
+                t0 = perf_counter()
+                status, _ = client.request('GET', path)
+                self.recorder.record(endpoint, page, (perf_counter() - t0) * 1000, status)
+                if status >= 500 or status == 0:
+                    self.page_failed = True
+                if client.conn:
+                    client.conn.close()
+            threads.append(threading.Thread(target=run))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    # ---- page scripts ----
+    def page_attendance(self):
+        page = 'attendance'
+        self.call(page, 'sessions', '/api/sessions')
+        self.call(page, 'sessions/current', '/api/sessions/current')
+        self.call(page, 'levels', '/api/levels')
+        dates = self.call(page, 'practice_dates', '/api/practice_dates') or {}
+        practice_dates = dates.get('dates') or [datetime.now().date().isoformat()]
+        day = self.rng.choice(practice_dates[-10:])
+        practice = self.call(page, 'practice_for_date', f'/api/practice_for_date?date={day}') or {}
+        if self.args.read_only:
+            return
+        session_id = (practice.get('session') or {}).get('id')
+        # Coach taps through a level's roster
+        levels = [lvl for lvl in practice.get('levels', []) if lvl.get('athletes')]
+        if not levels:
+            return
+        level = self.rng.choice(levels)
+        for athlete in level['athletes'][:self.rng.randint(3, 12)]:
+            self.think(self.args.tap_think)
+            self.call(page, 'attendance[POST]', '/api/attendance', 'POST', {
+                'athlete_id': athlete['id'],
+                'practice_date': day,
+                'level': level['level'],
+                'status': self.rng.choices(['present', 'absent', 'partial'], weights=[85, 10, 5])[0],
+                'session_id': session_id,
+            })
+
+    def page_personal_bests(self):
+        page = 'personal_bests'
+        meets = self.call(page, 'meets', '/api/meets') or self.fixtures['meets']
+        if not meets:
+            return
+        # Newest meet loads automatically, then the user browses a few more
+        browse = [meets[0]] + self.rng.sample(meets, min(len(meets), self.rng.randint(0, 3)))
+        for i, meet in enumerate(browse):
+            if i:
+                self.think(self.args.tap_think)
+            query = urlencode({'meet_name': meet['name'], 'comp_year': meet['comp_year']})
+            self.call(page, 'meet_scores', f'/api/meet_scores?{query}')
+
+    def page_athlete(self):
+        page = 'athlete'
+        athletes = self.call(page, 'athletes', '/api/athletes?active=false') or self.fixtures['athletes']
+        if not athletes:
+            return
+        name = self.rng.choice(athletes)['name']
+        self.call(page, 'athlete_profile', f'/api/athlete_profile?name={quote(name)}')
+        if self.rng.random() < 0.3:
+            self.think(self.args.tap_think)
+            self.call(page, 'athlete_profile[all_levels]',
+                      f'/api/athlete_profile?name={quote(name)}&all_levels=true')
+
+    def page_meet_averages(self):
+        page = 'meet_averages'
+        comp_years = self.fixtures['comp_years'] or ['2026']
+        comp_year = comp_years[0] if self.rng.random() < 0.8 else self.rng.choice(comp_years)
+        self.call(page, 'meet_level_averages', f'/api/meet_level_averages?comp_year={comp_year}')
+
+    def page_score_entry(self):
+        page = 'score_entry'
+        self.call_parallel(page, [('recent_athletes', '/api/recent_athletes'),
+                                  ('recent_meets', '/api/recent_meets')])
+        if not self.args.submit_scores or not self.fixtures['meets'] or not self.fixtures['athletes']:
+            return
+        meet = self.fixtures['meets'][0]
+        athlete = self.rng.choice(self.fixtures['athletes'])
+        self.think(self.args.tap_think * 4)
+        events = [{'event': ev, 'score': round(self.rng.uniform(8.0, 9.8), 3), 'place': None}
+                  for ev in ('Vault', 'Bars', 'Beam', 'Floor')]
+        self.call(page, 'submit_scores[POST]', '/api/submit_scores', 'POST', {
+            'meetName': meet['name'], 'meetDate': meet['latest_date'], 'compYear': meet['comp_year'],
+            'athleteName': athlete['name'], 'level': athlete.get('current_level') or '4',
+            'events': events,
+        })
+
+    def run(self):
+        # Stagger start so users don't arrive in lock-step
+        sleep(self.rng.uniform(0, self.args.ramp_up))
+        while time() < self.stop_at:
+            page = self.rng.choices(self.pages, weights=self.weights)[0]
+            self.page_failed = False
+            t0 = perf_counter()
+            getattr(self, f'page_{page}')()
+            self.recorder.record_page(page, (perf_counter() - t0) * 1000, not self.page_failed)
+            self.think(self.args.page_think)
+        if self.client.conn:
+            self.client.conn.close()
+
+# ============================================================
+# DRIVER
+# ============================================================
+def load_fixtures(base_url, timeout):
+    """Fetch meets/athletes/comp years once so users have realistic arguments."""
+    client = Client(base_url, timeout)
+    status, meets = client.request('GET', '/api/meets')
+    meets = json.loads(meets) if status == 200 else []
+    status, athletes = client.request('GET', '/api/athletes?active=false')
+    athletes = json.loads(athletes) if status == 200 else []
+    comp_years = []
+    for meet in meets:
+        if meet['comp_year'] not in comp_years:
+            comp_years.append(meet['comp_year'])
+    return {'meets': meets, 'athletes': athletes, 'comp_years': comp_years}
+
+def spawn_gunicorn(args):
+    port = urlsplit(args.url).port or 8000
+    cmd = ['gunicorn', 'score_entry_server:app', '--bind', f'127.0.0.1:{port}',
+           '--workers', str(args.workers), '--threads', str(args.threads),
+           '--timeout', '60', '--log-level', 'warning']
+    print(f"Spawning: {' '.join(cmd)}")
+    proc = subprocess.Popen(cmd, env=os.environ.copy())
+    deadline = time() + 30
+    while time() < deadline:
+        status, _ = Client(args.url, 2).request('GET', '/api/levels')
+        if status:
+            return proc
+        sleep(0.5)
+    proc.terminate()
+    print("ERROR: gunicorn did not become ready within 30s")
+    sys.exit(1)
+
+def summarize(recorder, duration, bucket_seconds):
+    samples = recorder.samples
+    total = len(samples)
+    errors = sum(1 for s in samples if s[4] >= 500 or s[4] == 0)
+    summary = {
+        'requests': total,
+        'duration_s': round(duration, 2),
+        'throughput_rps': round(total / duration, 2) if duration else 0,
+        'error_rate': round(errors / total, 4) if total else 0,
+        'endpoints': {},
+        'pages': {},
+        'timeline': [],
+    }
+
+    by_endpoint = defaultdict(list)
+    for offset, endpoint, page, ms, status in samples:
+        by_endpoint[endpoint].append((offset, ms, status))
+    for endpoint, rows in sorted(by_endpoint.items()):
+        rows.sort()
+        latencies = [ms for _, ms, _ in rows]
+        errs = sum(1 for _, _, st in rows if st >= 500 or st == 0)
+        summary['endpoints'][endpoint] = {
+            'count': len(rows),
+            'errors': errs,
+            'first_ms': round(rows[0][1], 2),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(max(latencies), 2),
+        }
+
+    by_page = defaultdict(list)
+    for page, ms, ok in recorder.pages:
+        by_page[page].append((ms, ok))
+    for page, rows in sorted(by_page.items()):
+        latencies = [ms for ms, _ in rows]
+        summary['pages'][page] = {
+            'loads': len(rows),
+            'failed': sum(1 for _, ok in rows if not ok),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+        }
+
+    buckets = defaultdict(list)
+    for offset, _, _, ms, status in samples:
+        buckets[int(offset // bucket_seconds)].append((ms, status))
+    for b in sorted(buckets):
+        rows = buckets[b]
+        latencies = [ms for ms, _ in rows]
+        summary['timeline'].append({
+            't': b * bucket_seconds,
+            'rps': round(len(rows) / bucket_seconds, 2),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'errors': sum(1 for _, st in rows if st >= 500 or st == 0),
+        })
+    return summary
+
+def print_summary(summary):
+    print(f"\nRequests: {summary['requests']}  Throughput: {summary['throughput_rps']} req/s  "
+          f"Error rate: {summary['error_rate'] * 100:.2f}%")
+    print(f"\n{'endpoint':<28} {'count':>6} {'err':>5} {'first':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for endpoint, s in summary['endpoints'].items():
+        print(f"{endpoint:<28} {s['count']:>6} {s['errors']:>5} {s['first_ms']:>9.1f} "
+              f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}")
+    print(f"\n{'page':<28} {'loads':>6} {'failed':>6} {'p50':>9} {'p95':>9}")
+    for page, s in summary['pages'].items():
+        print(f"{page:<28} {s['loads']:>6} {s['failed']:>6} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f}")
+    print(f"\n{'t (s)':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'errors':>7}")
+    for row in summary['timeline']:
+        print(f"{row['t']:>6} {row['rps']:>8.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['errors']:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay dashboard page traffic against the score server.')
+    parser.add_argument('--url', default='http://127.0.0.1:5050')
+    parser.add_argument('--users', type=int, default=20, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=60, help='seconds to run')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which users arrive')
+    parser.add_argument('--page-think', type=float, default=8, help='mean seconds between page loads')
+    parser.add_argument('--tap-think', type=float, default=1.5, help='mean seconds between taps on a page')
+    parser.add_argument('--think-scale', type=float, default=1.0, help='multiply all think times (0 = none)')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--read-only', action='store_true', help='skip attendance posts')
+    parser.add_argument('--submit-scores', action='store_true', help='include score submissions (inserts rows)')
+    parser.add_argument('--spawn', action='store_true', help='start gunicorn for the run')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--bucket', type=int, default=5, help='timeline bucket in seconds')
+    parser.add_argument('--random-seed', type=int, default=7)
+    parser.add_argument('--out', help='write the summary as JSON')
+    args = parser.parse_args()
+
+    proc = spawn_gunicorn(args) if args.spawn else None
+    try:
+        fixtures = load_fixtures(args.url, args.timeout)
+        print(f"Fixtures: {len(fixtures['meets'])} meets, {len(fixtures['athletes'])} athletes")
+        print(f"Running {args.users} users for {args.duration:.0f}s against {args.url}...")
+
+        recorder = Recorder()
+        stop_at = time() + args.duration
+        users = [VirtualUser(i, args, fixtures, recorder, stop_at) for i in range(args.users)]
+        started = perf_counter()
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+        summary = summarize(recorder, perf_counter() - started, args.bucket)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    print_summary(summary)
+    if args.out:
+        summary['meta'] = {'generated_at': datetime.now().isoformat(timespec='seconds'),
+                           'args': vars(args)}
+        with open(args.out, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSummary written to {args.out}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Migration script to make score submission idempotent.
+
+This script will:
+1. Create a backup of the scores table
+2. Report and delete duplicate scores (same athlete, meet, date, event and
+   level), keeping the most recently submitted row of each group
+3. Create the unique natural-key index submit_scores upserts against
+4. Create the idempotency_keys table for client-supplied Idempotency-Key headers
+
+The server creates the index and table itself at startup when the scores
+table has no duplicates; run this once on a database that already has some.
+
+Usage:
+1. Ensure DATABASE_URL is set in .env
+2. Run: python migrate_score_natural_key.py            (apply)
+   or:  python migrate_score_natural_key.py --dry-run  (report duplicates only)
+"""
+
+import os
+import sys
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from dotenv import load_dotenv
+from datetime import datetime
+
+load_dotenv()
+
+NATURAL_KEY = 'AthleteName, MeetName, MeetDate, Event, Level'
+
+def migrate(dry_run=False):
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        print("ERROR: DATABASE_URL not set in environment or .env file")
+        return False
+
+    print("Connecting to Neon PostgreSQL...")
+    conn = psycopg2.connect(database_url)
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+    try:
+        # Step 1: Find duplicates
+        print("\n1. Looking for duplicate scores...")
+        cursor.execute(f'''
+            SELECT {NATURAL_KEY}, COUNT(*) AS copies,
+                   ARRAY_AGG(Score ORDER BY id) AS scores
+            FROM scores
+            GROUP BY {NATURAL_KEY}
+            HAVING COUNT(*) > 1
+            ORDER BY MeetDate, MeetName, AthleteName, Event
+        ''')
+        duplicates = cursor.fetchall()
+        extra_rows = sum(row['copies'] - 1 for row in duplicates)
+        for row in duplicates:
+            print(f"   {row['meetdate']} {row['meetname']} / {row['athletename']} ({row['level']}) "
+                  f"{row['event']}: {row['copies']} rows, scores {[str(s) for s in row['scores']]}")
+        print(f"   [OK] {len(duplicates)} duplicated scores, {extra_rows} extra rows")
+
+        if dry_run:
+            print("\nDry run: no changes made.")
+            return True
+
+        # Step 2: Backup the scores table
+        backup_table_name = None
+        if extra_rows:
+            print("\n2. Creating backup of scores table...")
+            backup_table_name = f"scores_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            cursor.execute(f'CREATE TABLE {backup_table_name} AS SELECT * FROM scores')
+            print(f"   [OK] Backup created: {backup_table_name}")
+
+            # Step 3: Keep the newest row of each duplicate group
+            print("\n3. Deleting duplicates (keeping the latest submission)...")
+            cursor.execute(f'''
+                DELETE FROM scores s
+                USING scores newer
+                WHERE (s.AthleteName, s.MeetName, s.MeetDate, s.Event, s.Level)
+                    = (newer.AthleteName, newer.MeetName, newer.MeetDate, newer.Event, newer.Level)
+                  AND newer.id > s.id
+            ''')
+            print(f"   [OK] Deleted {cursor.rowcount} rows")
+
+        # Step 4: Natural key index and idempotency table
+        print("\n4. Creating natural key index and idempotency_keys table...")
+        cursor.execute(f'''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_scores_natural_key ON scores ({NATURAL_KEY})
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                key VARCHAR(255) PRIMARY KEY,
+                request_hash VARCHAR(64) NOT NULL,
+                response JSONB,
+                created_at TIMESTAMP DEFAULT NOW()
+            )
+        ''')
+        print("   [OK] Index and table created")
+
+        conn.commit()
+
+        print("\n" + "="*50)
+        print("[SUCCESS] Migration completed successfully!")
+        print("="*50)
+        if backup_table_name:
+            print(f"\nBackup table: {backup_table_name}")
+        print(f"Duplicate rows removed: {extra_rows}")
+
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n[ERROR]: {e}")
+        print("Migration rolled back. No changes were made.")
+        return False
+
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == '__main__':
+    migrate(dry_run='--dry-run' in sys.argv)
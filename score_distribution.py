@@ -0,0 +1,103 @@
+"""
+Mergeable score distributions for charting (quantile bands, medians).
+
+A Distribution is the exact set of scores in a cell, kept as a sorted NumPy
+array. A gym's season is a few thousand scores per event, so exact beats an
+approximate sketch here: quantiles are exact, and merging cells is one
+stable sort over already-sorted runs (linear time, no rescan of the table).
+
+SeasonDistributions holds one Distribution per (meet, level, event) for a comp
+year and builds the wider views from those cells on demand:
+- Gymfest-wide: one meet, all levels merged
+- season-wide: one level, all meets merged (or everything merged)
+Merged views are memoized, so a season's chart data costs one scores query.
+
+Quantiles use linear interpolation, so p50 matches the median used by
+meet_level_averages (mean of the two middle scores for an even count).
+"""
+
+from datetime import date
+
+import numpy as np
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+def quantile_label(q):
+    """0.1 -> 'p10', 0.025 -> 'p2.5'."""
+    return f'p{q * 100:g}'
+
+class Distribution:
+    """Exact, mergeable distribution of scores (a sorted float64 array)."""
+    __slots__ = ('values',)
+
+    def __init__(self, sorted_values):
+        self.values = sorted_values
+
+    @classmethod
+    def from_scores(cls, scores):
+        return cls(np.sort(np.asarray(scores, dtype=np.float64)))
+
+    @classmethod
+    def merge(cls, distributions):
+        """Combine distributions; each input is already sorted, so the stable sort is a run merge."""
+        parts = [d.values for d in distributions if d.values.size]
+        if not parts:
+            return cls(np.empty(0))
+        if len(parts) == 1:
+            return cls(parts[0])
+        return cls(np.sort(np.concatenate(parts), kind='stable'))
+
+    def __len__(self):
+        return int(self.values.size)
+
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        if not self.values.size:
+            return [None for _ in qs]
+        return np.quantile(self.values, qs).tolist()
+
+    def summary(self, qs=DEFAULT_QUANTILES):
+        """count, mean, min, max and the requested quantiles, or None if empty."""
+        if not self.values.size:
+            return None
+        result = {
+            'count': len(self),
+            'mean': round(float(self.values.mean()), 3),
+            'min': float(self.values[0]),
+            'max': float(self.values[-1]),
+        }
+        for q, value in zip(qs, self.quantiles(qs)):
+            result[quantile_label(q)] = round(value, 3)
+        return result
+
+EMPTY = Distribution(np.empty(0))
+
+class SeasonDistributions:
+    """Per (meet, level, event) distributions for one comp year, with memoized merges."""
+    def __init__(self, rows):
+        """rows: (meet_name, meet_date, level, event, score) for the comp year's non-NULL scores."""
+        scores = {}
+        first_date = {}
+        for meet_name, meet_date, level, event, score in rows:
+            scores.setdefault((meet_name, level, event), []).append(float(score))
+            if meet_date is not None and (meet_name not in first_date or meet_date < first_date[meet_name]):
+                first_date[meet_name] = meet_date
+        self.cells = {key: Distribution.from_scores(values) for key, values in scores.items()}
+        self.first_date = first_date
+        self.meets = sorted({meet for meet, _, _ in self.cells}, key=lambda m: (first_date.get(m, date.min), m))
+        self.levels = sorted({level for _, level, _ in self.cells})
+        self.events = sorted({event for _, _, event in self.cells})
+        self._merged = {}
+
+    def get(self, event, meet=None, level=None):
+        """Distribution for one event, narrowed to a meet and/or level (None = all of them)."""
+        key = (meet, level, event)
+        if meet is not None and level is not None:
+            return self.cells.get(key, EMPTY)
+        if key not in self._merged:
+            if meet is None:
+                # Season-wide: merge the per-meet views (themselves memoized)
+                parts = [self.get(event, m, level) for m in self.meets]
+            else:
+                parts = [self.cells[(meet, lvl, event)] for lvl in self.levels if (meet, lvl, event) in self.cells]
+            self._merged[key] = Distribution.merge(parts)
+        return self._merged[key]
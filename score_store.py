@@ -0,0 +1,604 @@
+"""
+In-memory columnar copy of the scores table.
+
+A gym's scores table (tens to hundreds of thousands of rows) fits comfortably
+in RAM as NumPy column arrays:
+- athlete, level, comp year, meet and event as integer category codes
+- meet dates as proleptic ordinals (date.toordinal())
+- scores as float64 (NaN for NULL), places as int32 (-1 for NULL)
+
+score_entry_server answers its read endpoints from a ScoreStore when
+SCORE_STORE=true. Responses built here mirror the SQL code paths field for
+field; meet_level_averages aggregates in Decimal, as the SQL does over
+NUMERIC scores, so its sums and averages round to the same floats.
+Ties are broken the same way as the SQL: a best score is the earliest one
+(MeetDate, then id), meets with the same first date go by name then comp
+year, and the most recent meet is the latest date, then highest id.
+
+The store loads everything once, then refreshes incrementally by id: after a
+score write in this process, or when a cheap COUNT/MAX(id) version check
+(at most every version_check_seconds) shows rows it hasn't seen.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+LOAD_SQL = '''
+    SELECT id, AthleteName, Level, CompYear, MeetName, MeetDate, Event, Score, Place
+    FROM scores
+    WHERE id > %s
+    ORDER BY id
+'''
+VERSION_SQL = 'SELECT COUNT(*), COALESCE(MAX(id), 0) FROM scores'
+
+class Categories:
+    """Append-only mapping between labels and small integer codes."""
+    def __init__(self):
+        self.labels = []
+        self.codes = {}
+
+    def code(self, label):
+        code = self.codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(label)
+            self.codes[label] = code
+        return code
+
+    def encode(self, values):
+        return np.fromiter((self.code(v) for v in values), dtype=np.int32, count=len(values))
+
+class Columns:
+    """One immutable snapshot of the table. Category objects may be shared with later snapshots."""
+    def __init__(self, categories, arrays):
+        self.athletes, self.levels, self.comp_years, self.meets, self.events = categories
+        self.id = arrays['id']
+        self.athlete = arrays['athlete']
+        self.level = arrays['level']
+        self.comp_year = arrays['comp_year']
+        self.meet = arrays['meet']
+        self.date = arrays['date']
+        self.event = arrays['event']
+        self.score = arrays['score']
+        self.place = arrays['place']
+        self.size = len(self.id)
+
+    @property
+    def categories(self):
+        return (self.athletes, self.levels, self.comp_years, self.meets, self.events)
+
+def _encode_rows(rows, categories):
+    athletes, levels, comp_years, meets, events = categories
+    n = len(rows)
+    return {
+        'id': np.fromiter((r[0] for r in rows), dtype=np.int64, count=n),
+        'athlete': athletes.encode([r[1] for r in rows]),
+        'level': levels.encode([r[2] for r in rows]),
+        'comp_year': comp_years.encode([r[3] for r in rows]),
+        'meet': meets.encode([r[4] for r in rows]),
+        'date': np.fromiter((r[5].toordinal() if r[5] else 0 for r in rows), dtype=np.int32, count=n),
+        'event': events.encode([r[6] for r in rows]),
+        'score': np.fromiter((float(r[7]) if r[7] is not None else np.nan for r in rows), dtype=np.float64, count=n),
+        'place': np.fromiter((r[8] if r[8] is not None else -1 for r in rows), dtype=np.int32, count=n),
+    }
+
+def _group_argmax(keys, values, candidates, dates, ids):
+    """
+    For each distinct key among the candidate rows, the index of the row with the largest value;
+    ties go to the earliest date, then the lowest id (ORDER BY value DESC, MeetDate, id).
+    """
+    idx = np.flatnonzero(candidates)
+    if idx.size == 0:
+        return {}
+    k = keys[idx]
+    # The last row of each key group wins, so the tie-breakers sort descending
+    order = np.lexsort((-ids[idx], -dates[idx], values[idx], k))
+    k_sorted = k[order]
+    last = np.flatnonzero(np.append(k_sorted[1:] != k_sorted[:-1], True))
+    return dict(zip(k_sorted[last].tolist(), idx[order][last].tolist()))
+
+def _numeric(values):
+    """Scores as Decimals, matching what psycopg2 returns for NUMERIC(5,3)."""
+    return [Decimal(f'{v:.3f}') for v in values]
+
+def _median(values):
+    s = sorted(values)
+    n = len(s)
+    if n == 0:
+        return None
+    if n % 2 == 0:
+        return (s[n // 2 - 1] + s[n // 2]) / 2
+    return s[n // 2]
+
+def _place(value):
+    return int(value) if value >= 0 else None
+
+class ScoreStore:
+    def __init__(self, query, version_check_seconds=30):
+        """query(sql, params) must return a list of tuples."""
+        self._query = query
+        self.version_check_seconds = version_check_seconds
+        self._lock = threading.Lock()
+        self.cols = None
+        self.max_id = 0
+        self.row_count = 0
+        self.loaded_at = None
+        self._stale = False
+        self._last_version_check = 0.0
+
+    # ---- loading ----
+    def load(self):
+        """Full (re)load of the table."""
+        with self._lock:
+            self._load_full()
+
+    def _load_full(self):
+        categories = (Categories(), Categories(), Categories(), Categories(), Categories())
+        rows = self._query(LOAD_SQL, (0,))
+        self.cols = Columns(categories, _encode_rows(rows, categories))
+        self.max_id = int(self.cols.id.max()) if self.cols.size else 0
+        self.row_count = self.cols.size
+        self.loaded_at = time.time()
+        self._stale = False
+        self._last_version_check = time.monotonic()
+        print(f"[STORE] Loaded {self.row_count} score rows")
+
+    def refresh(self):
+        """Pick up new rows by id; fall back to a full reload if rows disappeared or were marked stale."""
+        with self._lock:
+            count, max_id = self._query(VERSION_SQL, ())[0]
+            self._last_version_check = time.monotonic()
+            if self.cols is None or self._stale or max_id < self.max_id or count < self.row_count:
+                self._load_full()
+                return
+            if max_id == self.max_id and count == self.row_count:
+                return
+            rows = self._query(LOAD_SQL, (self.max_id,))
+            # A mismatch means rows were deleted as well as added
+            if self.row_count + len(rows) != count:
+                self._load_full()
+                return
+            if rows:
+                old = self.cols
+                new = _encode_rows(rows, old.categories)
+                arrays = {name: np.concatenate((getattr(old, name), new[name])) for name in new}
+                self.cols = Columns(old.categories, arrays)
+                self.max_id = int(new['id'].max())
+                self.row_count = self.cols.size
+
+    def mark_stale(self):
+        """Force a full reload on next access (after updates/deletes the id scan can't see)."""
+        self._stale = True
+        self._last_version_check = 0.0
+
+    def expire(self):
+        """Run the version check on next access (another worker wrote to the table)."""
+        self._last_version_check = 0.0
+
+    def ensure_fresh(self):
+        if self.cols is None or self._stale or \
+                time.monotonic() - self._last_version_check >= self.version_check_seconds:
+            self.refresh()
+        return self.cols
+
+    # ---- /api/meets ----
+    def meets(self):
+        c = self.ensure_fresh()
+        if c.size == 0:
+            return []
+        n_years = len(c.comp_years.labels)
+        key = c.meet.astype(np.int64) * n_years + c.comp_year
+        pairs = np.unique(key * 10_000_000 + c.date)
+        pair_keys = pairs // 10_000_000
+        pair_dates = pairs % 10_000_000
+        keys, first, counts = np.unique(pair_keys, return_index=True, return_counts=True)
+        earliest = pair_dates[first]
+        latest = pair_dates[first + counts - 1]
+        result = []
+        for i in range(keys.size):
+            meet_code, year_code = divmod(int(keys[i]), n_years)
+            result.append({
+                'name': c.meets.labels[meet_code],
+                'comp_year': c.comp_years.labels[year_code],
+                'earliest_date': date.fromordinal(int(earliest[i])).isoformat(),
+                'latest_date': date.fromordinal(int(latest[i])).isoformat(),
+                'date_count': int(counts[i]),
+            })
+        # ORDER BY MIN(MeetDate) DESC, MeetName, CompYear
+        result.sort(key=lambda m: (m['name'], m['comp_year']))
+        result.sort(key=lambda m: m['earliest_date'], reverse=True)
+        return result
+
+    # ---- /api/meet_scores ----
+    def comp_year_for_meet(self, meet_name, meet_date):
+        """Legacy lookup of a meet's CompYear from one of its dates."""
+        c = self.ensure_fresh()
+        meet_code = c.meets.codes.get(meet_name)
+        try:
+            ordinal = date.fromisoformat(meet_date).toordinal()
+        except ValueError:
+            return None
+        if meet_code is None:
+            return None
+        hits = np.flatnonzero((c.meet == meet_code) & (c.date == ordinal))
+        return c.comp_years.labels[c.comp_year[hits[0]]] if hits.size else None
+
+    def meet_scores(self, meet_name, comp_year):
+        """All scores for a meet (all dates) with PB flags, or None if the meet has no rows."""
+        c = self.ensure_fresh()
+        meet_code = c.meets.codes.get(meet_name)
+        year_code = c.comp_years.codes.get(str(comp_year))
+        if meet_code is None or year_code is None:
+            return None
+        in_meet = (c.meet == meet_code) & (c.comp_year == year_code)
+        rows = np.flatnonzero(in_meet)
+        if rows.size == 0:
+            return None
+
+        meet_dates = sorted(set(c.date[rows].tolist()))
+        earliest = meet_dates[0]
+        athlete_labels, event_labels = c.athletes.labels, c.events.labels
+        rows = sorted(rows.tolist(), key=lambda i: (athlete_labels[c.athlete[i]], event_labels[c.event[i]]))
+
+        n_levels, n_events, n_years = len(c.levels.labels), len(c.events.labels), len(c.comp_years.labels)
+        of_athletes = np.isin(c.athlete, np.unique(c.athlete[in_meet]))
+        valid = of_athletes & ~np.isnan(c.score)
+
+        # Distinct seasons per (athlete, level)
+        pair = c.athlete.astype(np.int64) * n_levels + c.level
+        triples = np.unique((pair * n_years + c.comp_year)[of_athletes])
+        pair_ids, season_counts = np.unique(triples // n_years, return_counts=True)
+        seasons_lookup = dict(zip(pair_ids.tolist(), season_counts.tolist()))
+
+        athlete_event = c.athlete.astype(np.int64) * n_events + c.event
+        year_best_rows = _group_argmax(athlete_event, c.score,
+                                       valid & (c.comp_year == year_code) & (c.date < earliest), c.date, c.id)
+        athlete_event_level = athlete_event * n_levels + c.level
+        prev_best_rows = _group_argmax(athlete_event_level, c.score, valid & (c.comp_year != year_code),
+                                       c.date, c.id)
+
+        all_scores = []
+        for i in rows:
+            athlete = athlete_labels[c.athlete[i]]
+            level = c.levels.labels[c.level[i]]
+            event = event_labels[c.event[i]]
+            place = _place(c.place[i])
+            seasons_at_level = seasons_lookup.get(int(pair[i]), 1)
+            current_score = float(c.score[i])
+            if np.isnan(current_score):
+                all_scores.append({
+                    'athlete': athlete, 'level': level, 'event': event,
+                    'score': None, 'place': place,
+                    'seasons_at_level': seasons_at_level
+                })
+                continue
+
+            yr = year_best_rows.get(int(athlete_event[i]))
+            year_best = float(c.score[yr]) if yr is not None else None
+            year_best_meet = c.meets.labels[c.meet[yr]] if yr is not None else None
+            year_best_date = date.fromordinal(int(c.date[yr])) if yr is not None else None
+
+            pr = prev_best_rows.get(int(athlete_event_level[i]))
+            prev_year_best = float(c.score[pr]) if pr is not None else None
+
+            if year_best is not None and (prev_year_best is None or year_best >= prev_year_best):
+                alltime_best, alltime_best_meet, alltime_best_date = year_best, year_best_meet, year_best_date
+            elif prev_year_best is not None:
+                alltime_best = prev_year_best
+                alltime_best_meet = c.meets.labels[c.meet[pr]]
+                alltime_best_date = date.fromordinal(int(c.date[pr]))
+            else:
+                alltime_best = alltime_best_meet = alltime_best_date = None
+
+            is_first_year_at_level = prev_year_best is None
+            is_first_meet_of_year = year_best is None
+            is_alltime_pb = (not is_first_year_at_level and alltime_best is not None
+                             and current_score > alltime_best)
+            is_year_pb = not is_first_meet_of_year and current_score > year_best
+
+            all_scores.append({
+                'athlete': athlete,
+                'level': level,
+                'event': event,
+                'score': current_score,
+                'place': place,
+                'is_first_year_at_level': is_first_year_at_level,
+                'is_first_meet_of_year': is_first_meet_of_year,
+                'is_year_pb': is_year_pb,
+                'is_alltime_pb': is_alltime_pb,
+                'year_best': year_best,
+                'year_best_meet': year_best_meet,
+                'year_best_date': year_best_date,
+                'alltime_best': alltime_best,
+                'alltime_best_meet': alltime_best_meet,
+                'alltime_best_date': alltime_best_date,
+                'year_improvement': round(current_score - year_best, 3) if year_best and is_year_pb else None,
+                'alltime_improvement': round(current_score - alltime_best, 3) if alltime_best and is_alltime_pb else None,
+                'seasons_at_level': seasons_at_level
+            })
+
+        return {
+            'meet_name': meet_name,
+            'meet_dates': [date.fromordinal(d).isoformat() for d in meet_dates],
+            'comp_year': comp_year,
+            'scores': all_scores
+        }
+
+    # ---- /api/personal_bests ----
+    def personal_bests(self):
+        """PBs at the most recent meet, or None if there are no scores."""
+        c = self.ensure_fresh()
+        if c.size == 0:
+            return None
+        latest = int(np.lexsort((c.id, c.date))[-1])  # ORDER BY MeetDate DESC, id DESC
+        meet_code, meet_ordinal, year_code = c.meet[latest], c.date[latest], c.comp_year[latest]
+
+        rows = np.flatnonzero((c.meet == meet_code) & (c.date == meet_ordinal))
+        athlete_labels, event_labels = c.athletes.labels, c.events.labels
+        rows = sorted(rows.tolist(), key=lambda i: (athlete_labels[c.athlete[i]], event_labels[c.event[i]]))
+
+        n_events = len(event_labels)
+        athlete_event = c.athlete.astype(np.int64) * n_events + c.event
+        prior = (c.comp_year == year_code) & (c.date < meet_ordinal) & ~np.isnan(c.score)
+        prev_rows = _group_argmax(athlete_event, c.score, prior, c.date, c.id)
+
+        personal_bests = []
+        for i in rows:
+            current_score = float(c.score[i])
+            if np.isnan(current_score):
+                continue
+            pr = prev_rows.get(int(athlete_event[i]))
+            prev_best = float(c.score[pr]) if pr is not None else None
+            if prev_best is None or current_score > prev_best:
+                personal_bests.append({
+                    'athlete': athlete_labels[c.athlete[i]],
+                    'level': c.levels.labels[c.level[i]],
+                    'event': event_labels[c.event[i]],
+                    'score': current_score,
+                    'place': _place(c.place[i]),
+                    'previous_best': prev_best,
+                    'improvement': round(current_score - prev_best, 3) if prev_best else None,
+                    'is_first_meet': prev_best is None
+                })
+
+        return {
+            'meet_name': c.meets.labels[meet_code],
+            'meet_date': date.fromordinal(int(meet_ordinal)),
+            'comp_year': c.comp_years.labels[year_code],
+            'personal_bests': personal_bests
+        }
+
+    # ---- /api/athlete_profile ----
+    def athlete_profile(self, athlete_name, all_levels=False):
+        """Score-derived parts of an athlete profile, or None if the athlete has no scores."""
+        c = self.ensure_fresh()
+        athlete_code = c.athletes.codes.get(athlete_name)
+        if athlete_code is None:
+            return None
+        rows = np.flatnonzero(c.athlete == athlete_code)
+        valid_rows = rows[~np.isnan(c.score[rows])]
+        if valid_rows.size == 0:
+            return None
+
+        # Most recent score; same date: first by event, meet name, id (the SQL path's row order)
+        latest_rows = valid_rows[c.date[valid_rows] == c.date[valid_rows].max()].tolist()
+        recent = min(latest_rows, key=lambda i: (c.events.labels[c.event[i]], c.meets.labels[c.meet[i]], int(c.id[i])))
+        level_code, year_code = c.level[recent], c.comp_year[recent]
+        seasons_at_level = int(np.unique(c.comp_year[rows][c.level[rows] == level_code]).size)
+
+        # Level history: one entry per (level, season), most recent first
+        last_meet = {}
+        for i in valid_rows.tolist():
+            key = (int(c.level[i]), int(c.comp_year[i]))
+            last_meet[key] = max(last_meet.get(key, 0), int(c.date[i]))
+        level_history = [c.levels.labels[lvl] for (lvl, _), _ in
+                         sorted(last_meet.items(), key=lambda item: item[1], reverse=True)]
+
+        shown = rows if all_levels else rows[c.level[rows] == level_code]
+        meets = sorted({(int(c.date[i]), int(c.meet[i]), int(c.comp_year[i])) for i in shown.tolist()})
+
+        # Running bests from all of the athlete's scores (any level), one pass per (event, season)
+        by_event_year = {}
+        best_by_year = {}
+        for i in valid_rows.tolist():
+            event, year, lvl, score = int(c.event[i]), int(c.comp_year[i]), int(c.level[i]), float(c.score[i])
+            by_event_year.setdefault((event, year), []).append((int(c.date[i]), score))
+            per_year = best_by_year.setdefault((event, lvl), {})
+            per_year[year] = max(per_year.get(year, score), score)
+        running = {}
+        for key, entries in by_event_year.items():
+            entries.sort()
+            dates, maxima, best = [], [], None
+            for d, score in entries:
+                best = score if best is None else max(best, score)
+                dates.append(d)
+                maxima.append(best)
+            running[key] = (dates, maxima)
+
+        event_labels = c.events.labels
+        ordered = sorted(shown.tolist(), key=lambda i: (int(c.date[i]), event_labels[c.event[i]]))
+        all_scores = []
+        for i in ordered:
+            row_level = c.levels.labels[c.level[i]]
+            event = event_labels[c.event[i]]
+            row_comp_year = c.comp_years.labels[c.comp_year[i]]
+            meet_date_str = date.fromordinal(int(c.date[i])).isoformat()
+            base = {
+                'athlete': athlete_name, 'level': row_level, 'event': event,
+                'place': _place(c.place[i]),
+                'meet_name': c.meets.labels[c.meet[i]], 'meet_date': meet_date_str,
+                'comp_year': row_comp_year
+            }
+            current_score = float(c.score[i])
+            if np.isnan(current_score):
+                base['score'] = None
+                all_scores.append(base)
+                continue
+
+            dates, maxima = running.get((int(c.event[i]), int(c.comp_year[i])), ([], []))
+            pos = bisect_left(dates, int(c.date[i]))
+            year_best = maxima[pos - 1] if pos else None
+            others = [v for y, v in best_by_year.get((int(c.event[i]), int(c.level[i])), {}).items()
+                      if y != int(c.comp_year[i])]
+            prev_year_best = max(others) if others else None
+
+            candidates = [v for v in (year_best, prev_year_best) if v is not None]
+            alltime_best = max(candidates) if candidates else None
+            is_first_year = prev_year_best is None
+            is_first_meet = year_best is None
+            is_alltime_pb = not is_first_year and alltime_best is not None and current_score > alltime_best
+            is_year_pb = not is_first_meet and current_score > year_best
+
+            base.update({
+                'score': current_score,
+                'is_first_year_at_level': is_first_year,
+                'is_first_meet_of_year': is_first_meet,
+                'is_year_pb': is_year_pb,
+                'is_alltime_pb': is_alltime_pb,
+                'year_best': year_best,
+                'alltime_best': alltime_best,
+                'year_improvement': round(current_score - year_best, 3) if year_best and is_year_pb else None,
+                'alltime_improvement': round(current_score - alltime_best, 3) if alltime_best and is_alltime_pb else None,
+                'seasons_at_level': seasons_at_level
+            })
+            all_scores.append(base)
+
+        return {
+            'level': c.levels.labels[level_code],
+            'comp_year': c.comp_years.labels[year_code],
+            'seasons_at_level': seasons_at_level,
+            'level_history': level_history,
+            'meets': [{'name': c.meets.labels[m], 'date': date.fromordinal(d).isoformat(),
+                       'comp_year': c.comp_years.labels[y]} for d, m, y in meets],
+            'scores': all_scores,
+        }
+
+    # ---- /api/meet_level_averages ----
+    def meet_level_averages(self, comp_year, level_order, team_events):
+        c = self.ensure_fresh()
+        present_years = np.unique(c.comp_year).tolist() if c.size else []
+        all_comp_years = sorted((c.comp_years.labels[y] for y in present_years), reverse=True)
+
+        year_code = c.comp_years.codes.get(str(comp_year))
+        in_year = np.flatnonzero(c.comp_year == year_code) if year_code is not None else np.array([], dtype=np.int64)
+
+        # Meets in this season, ordered by first date
+        first_date = {}
+        dates_by_meet = {}
+        for m, d in zip(c.meet[in_year].tolist(), c.date[in_year].tolist()):
+            first_date[m] = min(first_date.get(m, d), d)
+            dates_by_meet.setdefault(m, set()).add(d)
+        meet_codes = sorted(first_date, key=lambda m: (first_date[m], c.meets.labels[m]))
+
+        # Group valid scores by (meet, level, event), each group sorted by score descending
+        scored = in_year[~np.isnan(c.score[in_year])]
+        order = np.lexsort((c.id[scored], c.date[scored], -c.score[scored],
+                            c.event[scored], c.level[scored], c.meet[scored]))
+        scored = scored[order]
+        groups = {}
+        if scored.size:
+            keys = np.stack((c.meet[scored], c.level[scored], c.event[scored]), axis=1)
+            bounds = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+            for chunk in np.split(scored, bounds):
+                i = chunk[0]
+                groups[(int(c.meet[i]), int(c.level[i]), int(c.event[i]))] = chunk
+
+        athlete_labels = c.athletes.labels
+        aa_code = c.events.codes.get('All Around')
+        event_codes = {ev: c.events.codes.get(ev) for ev in team_events}
+        empty = np.array([], dtype=np.int64)
+
+        results = []
+        for m in meet_codes:
+            meet_data = {
+                'meet_name': c.meets.labels[m],
+                'meet_dates': [date.fromordinal(d) for d in sorted(dates_by_meet[m])],
+                'earliest_date': date.fromordinal(first_date[m]),
+                'comp_year': c.comp_years.labels[year_code],
+                'levels': {},
+                'gymfest_avg': None,
+                'gymfest_median': None,
+                'gymfest_count': 0,
+                'gymfest_event_top3': None,
+                'gymfest_team_score': None
+            }
+            all_aa_scores = []
+            all_event_rows = {ev: [] for ev in team_events}
+
+            for level in level_order:
+                level_code = c.levels.codes.get(level)
+                aa_rows = groups.get((m, level_code, aa_code), empty) if level_code is not None else empty
+                if aa_rows.size == 0:
+                    meet_data['levels'][level] = None
+                    continue
+                scores_list = _numeric(c.score[aa_rows].tolist())
+
+                event_top3 = {}
+                team_score = 0
+                has_team_score = True
+                level_event_scores = {}
+                for event in team_events:
+                    event_rows = groups.get((m, level_code, event_codes[event]), empty)
+                    event_scores = _numeric(c.score[event_rows].tolist())
+                    event_athletes = [athlete_labels[a] for a in c.athlete[event_rows].tolist()]
+                    level_event_scores[event] = event_scores
+                    if len(event_scores) >= 3:
+                        event_top3[event] = [{'athlete': a, 'score': s}
+                                             for a, s in zip(event_athletes[:3], event_scores[:3])]
+                        team_score += sum(event_scores[:3])
+                    else:
+                        has_team_score = False
+                    all_event_rows[event].extend(event_rows.tolist())
+
+                if not has_team_score:
+                    team_score = None
+                    event_top3 = None
+                event_medians = [_median(level_event_scores[ev]) for ev in team_events]
+                median_score = sum(event_medians) if all(v is not None for v in event_medians) else None
+
+                meet_data['levels'][level] = {
+                    'avg': sum(scores_list) / len(scores_list),
+                    'median': median_score,
+                    'count': len(scores_list),
+                    'team_score': team_score,
+                    'event_top3': event_top3
+                }
+                all_aa_scores.extend(scores_list)
+
+            if all_aa_scores:
+                meet_data['gymfest_avg'] = sum(all_aa_scores) / len(all_aa_scores)
+                meet_data['gymfest_count'] = len(all_aa_scores)
+                medians = [_median(_numeric(c.score[all_event_rows[ev]].tolist())) for ev in team_events]
+                meet_data['gymfest_median'] = sum(medians) if all(v is not None for v in medians) else None
+
+                gymfest_event_top3 = {}
+                gymfest_team_score = 0
+                for event in team_events:
+                    # Ties: earliest MeetDate, then id (as TeamScores.gymfest_team)
+                    best = sorted(all_event_rows[event], key=lambda i: (-c.score[i], c.date[i], c.id[i]))[:3]
+                    top = [{'athlete': athlete_labels[c.athlete[i]], 'score': _numeric([c.score[i]])[0],
+                            'level': c.levels.labels[c.level[i]]} for i in best]
+                    if len(top) < 3:
+                        gymfest_event_top3 = None
+                        break
+                    gymfest_event_top3[event] = top
+                    gymfest_team_score += sum(item['score'] for item in top)
+                if gymfest_event_top3 is not None:
+                    meet_data['gymfest_event_top3'] = gymfest_event_top3
+                    meet_data['gymfest_team_score'] = gymfest_team_score
+
+            results.append(meet_data)
+
+        levels_with_data = [level for level in level_order
+                            if any(meet['levels'].get(level) is not None for meet in results)]
+        return {
+            'level_order': levels_with_data,
+            'all_comp_years': all_comp_years,
+            'comp_year': comp_year,
+            'meets': results
+        }
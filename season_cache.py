@@ -0,0 +1,118 @@
+"""
+Persistent, content-addressed cache for finished-season API responses.
+
+Scores for a finished comp year never change, so their responses can outlive
+the process: they are written once to local disk and served from there after
+restarts and deploys, and by every worker on the machine.
+
+Layout under the cache root:
+- objects/<sha256>.json      response bodies, named by their content hash
+- refs/<comp_year>/<sha1>    one file per request key, holding the object hash
+
+Bodies are memory-mapped on read, so workers share one copy through the OS
+page cache and a hit is a single copy out of it - no read() loop, no JSON
+work. Writes go through a temp file and os.replace, so readers see either the
+old file or the new one.
+
+Entries are dropped only by invalidate(): an explicit admin purge, or a score
+write that touches the comp year. Objects no longer referenced are deleted
+at the same time.
+"""
+
+import os
+import re
+import mmap
+import shutil
+import hashlib
+import tempfile
+
+def _safe(comp_year):
+    return re.sub(r'[^A-Za-z0-9_-]', '_', str(comp_year)) or '_'
+
+class SeasonCache:
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.refs_dir = os.path.join(root, 'refs')
+
+    def _ref_path(self, comp_year, key):
+        return os.path.join(self.refs_dir, _safe(comp_year), hashlib.sha1(key.encode()).hexdigest())
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, f'{digest}.json')
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def get(self, comp_year, key):
+        """Body bytes for key, or None on a miss."""
+        try:
+            with open(self._ref_path(comp_year, key), 'r') as f:
+                digest = f.read().strip()
+            with open(self._object_path(digest), 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[:]
+        except (FileNotFoundError, ValueError):
+            # Missing ref/object (purged concurrently) or an empty file
+            return None
+
+    def put(self, comp_year, key, body):
+        """Store body for key; identical bodies share one object file."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            self._write_atomic(path, body)
+        self._write_atomic(self._ref_path(comp_year, key), digest.encode())
+        return digest
+
+    def invalidate(self, comp_year=None):
+        """Drop one comp year's entries (or everything); returns the number of entries removed."""
+        if comp_year is None:
+            removed = sum(len(files) for _, _, files in os.walk(self.refs_dir))
+            shutil.rmtree(self.root, ignore_errors=True)
+            return removed
+        year_dir = os.path.join(self.refs_dir, _safe(comp_year))
+        if not os.path.isdir(year_dir):
+            return 0
+        removed = len(os.listdir(year_dir))
+        shutil.rmtree(year_dir, ignore_errors=True)
+        self._collect_garbage()
+        return removed
+
+    def _collect_garbage(self):
+        """Delete objects that no ref points to any more."""
+        live = set()
+        for dirpath, _, files in os.walk(self.refs_dir):
+            for name in files:
+                try:
+                    with open(os.path.join(dirpath, name)) as f:
+                        live.add(f.read().strip())
+                except FileNotFoundError:
+                    pass
+        if not os.path.isdir(self.objects_dir):
+            return
+        for name in os.listdir(self.objects_dir):
+            if name.endswith('.json') and name[:-len('.json')] not in live:
+                try:
+                    os.unlink(os.path.join(self.objects_dir, name))
+                except FileNotFoundError:
+                    pass
+
+    def info(self):
+        """Entry counts per comp year plus object count and total size on disk."""
+        comp_years = {}
+        if os.path.isdir(self.refs_dir):
+            for name in sorted(os.listdir(self.refs_dir)):
+                comp_years[name] = len(os.listdir(os.path.join(self.refs_dir, name)))
+        objects = os.listdir(self.objects_dir) if os.path.isdir(self.objects_dir) else []
+        size = sum(os.path.getsize(os.path.join(self.objects_dir, name)) for name in objects)
+        return {'comp_years': comp_years, 'objects': len(objects), 'bytes': size}
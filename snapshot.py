@@ -0,0 +1,315 @@
+"""
+Local SQLite snapshot of the gym database for offline and low-latency reads.
+
+Copies scores, athletes, sessions, practice_schedules, special_practice_dates
+and attendance from Postgres into a single SQLite file. score_entry_server can
+then answer GET endpoints from that file (SNAPSHOT_READS=true) - sub-millisecond
+local reads, and the dashboards keep working when the venue has no internet.
+
+Refresh is incremental where the source allows it:
+- scores:     rows with id > the last copied id, or updated_at >= the last
+              copied updated_at (corrections keep their id)
+- attendance: rows with updated_at >= the last copied updated_at
+- the small tables (athletes, sessions, schedules, special dates) are replaced
+A row-count mismatch after an incremental pass (deletes, or updates the id scan
+can't see) triggers a full copy of that table. Everything is applied in one
+SQLite transaction in WAL mode, so readers never see a half-refreshed file.
+
+Usage:
+1. Ensure DATABASE_URL is set in .env
+2. Run: python snapshot.py [--path gymfest_snapshot.db] [--full]
+"""
+
+import os
+import re
+import sqlite3
+import argparse
+from time import perf_counter
+from datetime import date, time, datetime
+from decimal import Decimal
+
+import psycopg2
+import psycopg2.extras
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_PATH = 'gymfest_snapshot.db'
+
+# Column lists are explicit so the SQLite schema keeps the declared types the
+# converters below rely on (DATE, TIME, TIMESTAMP, BOOLEAN).
+TABLES = {
+    'scores': '''
+        id INTEGER PRIMARY KEY, AthleteName TEXT, Level TEXT, CompYear TEXT, MeetName TEXT,
+        MeetDate DATE, Event TEXT, StartValue REAL, Score REAL, Place INTEGER, updated_at TIMESTAMP
+    ''',
+    'athletes': '''
+        id INTEGER PRIMARY KEY, name TEXT, current_level TEXT, active BOOLEAN, birthday DATE,
+        created_at TIMESTAMP
+    ''',
+    'sessions': '''
+        id INTEGER PRIMARY KEY, name TEXT, year INTEGER, season TEXT, start_date DATE, end_date DATE,
+        created_at TIMESTAMP
+    ''',
+    'practice_schedules': '''
+        id INTEGER PRIMARY KEY, session_id INTEGER, level TEXT, day_of_week INTEGER,
+        start_time TIME, end_time TIME, created_at TIMESTAMP
+    ''',
+    'special_practice_dates': '''
+        id INTEGER PRIMARY KEY, session_id INTEGER, practice_date DATE, level TEXT,
+        start_time TIME, end_time TIME, description TEXT, created_at TIMESTAMP
+    ''',
+    'attendance': '''
+        id INTEGER PRIMARY KEY, athlete_id INTEGER, session_id INTEGER, practice_date DATE, level TEXT,
+        status TEXT, notes TEXT, late_minutes INTEGER, created_at TIMESTAMP, updated_at TIMESTAMP
+    ''',
+}
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_scores_athlete ON scores(AthleteName, Event)',
+    'CREATE INDEX IF NOT EXISTS idx_scores_meet ON scores(MeetName, CompYear)',
+    'CREATE INDEX IF NOT EXISTS idx_scores_date ON scores(MeetDate)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_session ON attendance(session_id)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(practice_date, level)',
+    'CREATE INDEX IF NOT EXISTS idx_sessions_dates ON sessions(start_date, end_date)',
+    'CREATE INDEX IF NOT EXISTS idx_schedules_session ON practice_schedules(session_id)',
+]
+
+def _columns(table):
+    return [part.split()[0] for part in TABLES[table].split(',') if part.strip()]
+
+# ---- type conversion (Python <-> SQLite text) ----
+def _to_sqlite(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+sqlite3.register_adapter(date, lambda v: v.isoformat())
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(sep=' '))
+sqlite3.register_adapter(time, lambda v: v.isoformat())
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter('DATE', lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter('TIME', lambda b: time.fromisoformat(b.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter('BOOLEAN', lambda b: b not in (b'0', b''))
+
+# ============================================================
+# EXPORT / REFRESH
+# ============================================================
+def _open_for_write(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    for table, columns in TABLES.items():
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {table} ({columns})')
+        # Snapshots written by an older version lack columns added since
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for column in filter(str.strip, columns.split(',')):
+            if column.split()[0] not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column.strip()}')
+    conn.execute('CREATE TABLE IF NOT EXISTS snapshot_meta (key TEXT PRIMARY KEY, value TEXT)')
+    for statement in INDEXES:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+def _meta(conn, key, default=None):
+    row = conn.execute('SELECT value FROM snapshot_meta WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else default
+
+def _set_meta(conn, key, value):
+    conn.execute('INSERT OR REPLACE INTO snapshot_meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+def _copy(pg_cursor, lite, table, where='', params=(), replace_all=False):
+    """Copy rows from Postgres into the snapshot table; returns the number of rows copied."""
+    columns = _columns(table)
+    try:
+        pg_cursor.execute('SAVEPOINT snapshot_copy')
+        pg_cursor.execute(f'SELECT {", ".join(columns)} FROM {table} {where}', params)
+        rows = pg_cursor.fetchall()
+        pg_cursor.execute('RELEASE SAVEPOINT snapshot_copy')
+    except psycopg2.errors.UndefinedTable:
+        # special_practice_dates is created lazily by the server
+        pg_cursor.execute('ROLLBACK TO SAVEPOINT snapshot_copy')
+        rows = []
+    if replace_all:
+        lite.execute(f'DELETE FROM {table}')
+    placeholders = ', '.join('?' for _ in columns)
+    lite.executemany(f'INSERT OR REPLACE INTO {table} ({", ".join(columns)}) VALUES ({placeholders})',
+                     ([_to_sqlite(v) for v in row] for row in rows))
+    return len(rows)
+
+def _source_count(pg_cursor, table):
+    pg_cursor.execute(f'SELECT COUNT(*) FROM {table}')
+    return pg_cursor.fetchone()[0]
+
+def refresh_snapshot(pg_conn, path=DEFAULT_PATH, full=False):
+    """Bring the snapshot file up to date from Postgres. Returns {table: rows copied}."""
+    lite = _open_for_write(path)
+    pg_cursor = pg_conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+    copied = {}
+    try:
+        lite.execute('BEGIN IMMEDIATE')
+        full = full or _meta(lite, 'refreshed_at') is None
+
+        # scores: append by id, plus corrected rows by updated_at
+        last_id = 0 if full else int(_meta(lite, 'scores_last_id', 0))
+        scores_since = None if full else _meta(lite, 'scores_updated_at')
+        if full or scores_since is None:
+            copied['scores'] = _copy(pg_cursor, lite, 'scores', replace_all=True)
+        else:
+            copied['scores'] = _copy(pg_cursor, lite, 'scores', 'WHERE id > %s OR updated_at >= %s',
+                                     (last_id, scores_since))
+            if lite.execute('SELECT COUNT(*) FROM scores').fetchone()[0] != _source_count(pg_cursor, 'scores'):
+                copied['scores'] = _copy(pg_cursor, lite, 'scores', replace_all=True)
+        _set_meta(lite, 'scores_last_id', lite.execute('SELECT COALESCE(MAX(id), 0) FROM scores').fetchone()[0])
+        latest = lite.execute('SELECT MAX(updated_at) FROM scores').fetchone()[0]
+        if latest:
+            _set_meta(lite, 'scores_updated_at', latest)
+
+        # attendance: upsert by updated_at
+        since = None if full else _meta(lite, 'attendance_updated_at')
+        if since:
+            copied['attendance'] = _copy(pg_cursor, lite, 'attendance', 'WHERE updated_at >= %s', (since,))
+            if lite.execute('SELECT COUNT(*) FROM attendance').fetchone()[0] != _source_count(pg_cursor, 'attendance'):
+                copied['attendance'] = _copy(pg_cursor, lite, 'attendance', replace_all=True)
+        else:
+            copied['attendance'] = _copy(pg_cursor, lite, 'attendance', replace_all=True)
+        latest = lite.execute('SELECT MAX(updated_at) FROM attendance').fetchone()[0]
+        if latest:
+            _set_meta(lite, 'attendance_updated_at', latest)
+
+        # Small tables: replace wholesale
+        for table in ('athletes', 'sessions', 'practice_schedules', 'special_practice_dates'):
+            copied[table] = _copy(pg_cursor, lite, table, replace_all=True)
+
+        _set_meta(lite, 'refreshed_at', datetime.now().isoformat(timespec='seconds'))
+        lite.commit()
+    except Exception:
+        lite.rollback()
+        raise
+    finally:
+        pg_conn.rollback()
+        lite.close()
+    return copied
+
+def snapshot_info(path=DEFAULT_PATH):
+    """Metadata about a snapshot file, or None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path)
+    try:
+        info = dict(conn.execute('SELECT key, value FROM snapshot_meta').fetchall())
+        for table in TABLES:
+            info[f'{table}_rows'] = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        info['size_bytes'] = os.path.getsize(path)
+        return info
+    finally:
+        conn.close()
+
+# ============================================================
+# READ-ONLY CONNECTION (psycopg2-style API for the server's handlers)
+# ============================================================
+class SnapshotReadOnlyError(Exception):
+    """Raised when a write is attempted against the snapshot."""
+
+_SCORE_SCALE = Decimal('0.001')
+_DATE_TEXT = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_WRITE_STATEMENT = re.compile(r'^\s*(INSERT|UPDATE|DELETE|ALTER|DROP|TRUNCATE)\b', re.IGNORECASE)
+_DDL_STATEMENT = re.compile(r'^\s*CREATE\s+(TABLE|INDEX)\s+IF\s+NOT\s+EXISTS\b', re.IGNORECASE)
+
+class SnapshotCursor:
+    """Minimal RealDictCursor look-alike: %s placeholders in, dicts with lowercase keys out."""
+    def __init__(self, conn, on_query=None, dict_rows=True):
+        self._cursor = conn.cursor()
+        self._on_query = on_query
+        self._dict_rows = dict_rows
+        self.rowcount = -1
+        self.description = None
+
+    def execute(self, query, vars=None):
+        if _DDL_STATEMENT.match(query):
+            # The handlers' lazy CREATE TABLE IF NOT EXISTS calls; the snapshot already has the tables
+            self.description = None
+            return
+        if _WRITE_STATEMENT.match(query):
+            raise SnapshotReadOnlyError('The local snapshot is read-only')
+        started = perf_counter()
+        self._cursor.execute(query.replace('%s', '?'), tuple(vars) if vars else ())
+        self.rowcount = self._cursor.rowcount
+        self.description = self._cursor.description
+        if self._on_query:
+            self._on_query(query, vars, perf_counter() - started)
+
+    def _row(self, row):
+        result = {}
+        for column, value in zip(self.description, row):
+            # Aggregates (MIN(MeetDate) ...) lose the declared type; restore dates
+            if isinstance(value, str) and _DATE_TEXT.match(value):
+                value = date.fromisoformat(value)
+            # Every non-integer number in the schema is NUMERIC(5,3) in Postgres
+            elif isinstance(value, float):
+                value = Decimal(repr(value))
+                if value == value.quantize(_SCORE_SCALE):
+                    value = value.quantize(_SCORE_SCALE)
+            result[column[0].lower()] = value
+        return result if self._dict_rows else tuple(result.values())
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._row(row) if row is not None else None
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+class SnapshotConnection:
+    def __init__(self, path, on_query=None):
+        self._conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True,
+                                     detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self._on_query = on_query
+
+    def cursor(self, cursor_factory=None):
+        # Plain psycopg2 cursors (e.g. the score store's loader) get tuples back
+        dict_rows = cursor_factory is None or issubclass(cursor_factory, psycopg2.extras.RealDictCursor)
+        return SnapshotCursor(self._conn, self._on_query, dict_rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._conn.close()
+
+def connect(path=DEFAULT_PATH, on_query=None):
+    """Open the snapshot read-only."""
+    return SnapshotConnection(path, on_query)
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the gym database to a local SQLite snapshot.')
+    parser.add_argument('--path', default=os.environ.get('SNAPSHOT_PATH', DEFAULT_PATH))
+    parser.add_argument('--full', action='store_true', help='recopy every table instead of refreshing')
+    args = parser.parse_args()
+
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        print("ERROR: DATABASE_URL not set in environment or .env file")
+        return
+    print("Connecting to Neon PostgreSQL...")
+    pg_conn = psycopg2.connect(database_url)
+    try:
+        copied = refresh_snapshot(pg_conn, args.path, args.full)
+    finally:
+        pg_conn.close()
+    print(f"[SUCCESS] Snapshot written to {args.path}")
+    for table, count in copied.items():
+        print(f"   {table}: {count} rows copied")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Incrementally maintained team scores (top 3 per event) for meet_level_averages.
+
+A team score is the sum of the three best scores on each of Vault, Bars, Beam
+and Floor - per level, and across all levels for the Gymfest team. Instead of
+re-sorting every event's scores on each request, TeamScores keeps bounded
+min-heaps of the top K entries:
+- per (meet, level, event)
+- per (meet, event) across levels (Gymfest)
+A new score is one heap push (O(log K)), and reading a meet's team scores
+only looks at K entries per heap.
+
+Each comp year is loaded on first use, then refreshed incrementally by id:
+after a score write in this process, or when a cheap COUNT/MAX(id) version
+check (at most every version_check_seconds) shows rows it hasn't seen. Rows
+that disappeared trigger a reload of that comp year. rebuild() is the path
+for corrections (UPDATEs the id scan can't see).
+"""
+
+import heapq
+import threading
+import time
+
+LOAD_SQL = '''
+    SELECT id, MeetName, Level, Event, AthleteName, Score, MeetDate
+    FROM scores
+    WHERE CompYear = %s AND Event IN ({events}) AND Score IS NOT NULL AND id > %s
+    ORDER BY id
+'''
+VERSION_SQL = '''
+    SELECT COUNT(*), COALESCE(MAX(id), 0) FROM scores
+    WHERE CompYear = %s AND Event IN ({events}) AND Score IS NOT NULL
+'''
+
+class TopK:
+    """The K highest scores pushed so far (ties: the earliest MeetDate, then the lowest id wins)."""
+    __slots__ = ('k', 'heap')
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+
+    def push(self, score, meet_date, row_id, athlete, level):
+        entry = (score, -meet_date.toordinal(), -row_id, athlete, level)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def best(self):
+        """Entries, highest score first."""
+        return sorted(self.heap, reverse=True)
+
+class _Season:
+    def __init__(self, k):
+        self.k = k
+        self.level_top = {}    # (meet, level, event) -> TopK
+        self.gymfest_top = {}  # (meet, event) -> TopK
+        self.max_id = 0
+        self.row_count = 0
+        self.checked_at = time.monotonic()
+
+    def add(self, rows):
+        for row_id, meet, level, event, athlete, score, meet_date in rows:
+            level_key = (meet, level, event)
+            if level_key not in self.level_top:
+                self.level_top[level_key] = TopK(self.k)
+            self.level_top[level_key].push(score, meet_date, row_id, athlete, level)
+            meet_key = (meet, event)
+            if meet_key not in self.gymfest_top:
+                self.gymfest_top[meet_key] = TopK(self.k)
+            self.gymfest_top[meet_key].push(score, meet_date, row_id, athlete, level)
+            self.max_id = max(self.max_id, row_id)
+        self.row_count += len(rows)
+
+class TeamScores:
+    """Top-K scores per meet/level/event and per meet/event, kept per comp year."""
+    def __init__(self, query, events, k=3, version_check_seconds=30):
+        self._query = query
+        self.events = tuple(events)
+        placeholders = ', '.join(['%s'] * len(self.events))
+        self._load_sql = LOAD_SQL.format(events=placeholders)
+        self._version_sql = VERSION_SQL.format(events=placeholders)
+        self.k = k
+        self.version_check_seconds = version_check_seconds
+        self._seasons = {}
+        self._lock = threading.Lock()
+
+    def _load(self, comp_year):
+        season = _Season(self.k)
+        season.add(self._query(self._load_sql, (comp_year, *self.events, 0)))
+        self._seasons[comp_year] = season
+        return season
+
+    def refresh(self, comp_year):
+        """Pick up new rows for a loaded comp year; reload it if rows disappeared."""
+        with self._lock:
+            season = self._seasons.get(comp_year)
+            if season is None:
+                return self._load(comp_year)
+            count, max_id = self._query(self._version_sql, (comp_year, *self.events))[0]
+            season.checked_at = time.monotonic()
+            if count == season.row_count and max_id == season.max_id:
+                return season
+            if count < season.row_count or max_id < season.max_id:
+                return self._load(comp_year)
+            rows = self._query(self._load_sql, (comp_year, *self.events, season.max_id))
+            if season.row_count + len(rows) != count:
+                return self._load(comp_year)
+            season.add(rows)
+            return season
+
+    def rebuild(self, comp_year=None):
+        """Drop one comp year (or all); they reload from the table on next use."""
+        with self._lock:
+            if comp_year is None:
+                self._seasons.clear()
+            else:
+                self._seasons.pop(comp_year, None)
+
+    def expire(self, comp_year):
+        """Run the version check on next use (another worker wrote to this comp year)."""
+        season = self._seasons.get(comp_year)
+        if season is not None:
+            season.checked_at = float('-inf')
+
+    def _season(self, comp_year):
+        season = self._seasons.get(comp_year)
+        if season is None or time.monotonic() - season.checked_at >= self.version_check_seconds:
+            season = self.refresh(comp_year)
+        return season
+
+    def _team(self, tops, with_level):
+        """(event_top3, team_score) from one TopK per event; (None, None) unless every event has K scores."""
+        event_top = {}
+        total = 0
+        for event in self.events:
+            top = tops.get(event)
+            if top is None or len(top.heap) < self.k:
+                return None, None
+            entries = top.best()
+            event_top[event] = [
+                {'athlete': athlete, 'score': score, **({'level': level} if with_level else {})}
+                for score, _, _, athlete, level in entries
+            ]
+            total += sum(entry[0] for entry in entries)
+        return event_top, total
+
+    def level_team(self, comp_year, meet, level):
+        season = self._season(comp_year)
+        return self._team({e: season.level_top.get((meet, level, e)) for e in self.events}, False)
+
+    def gymfest_team(self, comp_year, meet):
+        season = self._season(comp_year)
+        return self._team({e: season.gymfest_top.get((meet, e)) for e in self.events}, True)
+
+    def levels(self, comp_year, meet):
+        """Levels with any team-event score at this meet."""
+        season = self._season(comp_year)
+        return {level for (m, level, _) in season.level_top if m == meet}